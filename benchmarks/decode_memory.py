@@ -0,0 +1,90 @@
+# benchmarks/decode_memory.py
+"""
+Pico de RSS ao decodificar uma faixa estéreo longa (60 minutos por padrão).
+
+Compara `read_audio` (float32 intercalado, sem AudioSegment) com o caminho
+antigo via pydub (`AudioSegment` + `get_array_of_samples` + cópia float32).
+Cada medida roda em um processo novo.
+
+Uso: python -m benchmarks.decode_memory --minutes 60
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+import soundfile as sf
+
+
+def generate_input(path: str, minutes: float, sample_rate: int) -> None:
+    block = sample_rate * 30
+    remaining = int(minutes * 60 * sample_rate)
+    t0 = 0
+    with sf.SoundFile(
+        path, "w", samplerate=sample_rate, channels=2, subtype="PCM_16"
+    ) as f:
+        while remaining > 0:
+            n = min(block, remaining)
+            t = (t0 + np.arange(n)) / sample_rate
+            left = 0.3 * np.sin(2 * np.pi * 440 * t)
+            right = 0.3 * np.sin(2 * np.pi * 660 * t)
+            f.write(np.column_stack([left, right]))
+            remaining -= n
+            t0 += n
+
+
+def run_child(mode: str, input_path: str) -> None:
+    start = time.perf_counter()
+    if mode == "read_audio":
+        from src.fat.io_handlers import read_audio
+        from src.fat.types import AudioTypes
+
+        audio = read_audio(input_path, AudioTypes.WAV)
+        nbytes = audio.samples.nbytes
+    else:
+        from pydub import AudioSegment
+
+        segment = AudioSegment.from_file(input_path, format="wav")
+        samples = np.array(segment.get_array_of_samples(), dtype=np.float32)
+        nbytes = samples.nbytes
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{peak_kb} {nbytes} {elapsed}")
+
+
+def measure(mode: str, input_path: str) -> tuple[float, float, float]:
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.decode_memory", "--child", mode, input_path],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    peak_kb, nbytes, elapsed = out.stdout.strip().splitlines()[-1].split()
+    return int(peak_kb) / 1024, int(nbytes) / 2**20, float(elapsed)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        run_child(sys.argv[2], sys.argv[3])
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--minutes", type=float, default=60)
+    parser.add_argument("--sample-rate", type=int, default=44_100)
+    parser.add_argument("--skip-pydub", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, "input.wav")
+        generate_input(input_path, args.minutes, args.sample_rate)
+        modes = ["read_audio"] if args.skip_pydub else ["read_audio", "pydub"]
+        for mode in modes:
+            peak, pcm, elapsed = measure(mode, input_path)
+            print(
+                f"{mode:>10}: pico RSS {peak:9.1f} MB | PCM float32 {pcm:8.1f} MB "
+                f"| {peak / pcm:4.2f}x | {elapsed:6.2f} s"
+            )
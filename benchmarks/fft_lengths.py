@@ -0,0 +1,119 @@
+# benchmarks/fft_lengths.py
+"""
+Custo do IST em comprimentos de FFT ruins (com fatores primos grandes)
+contra os mesmos sinais completados até um comprimento 5-smooth
+(`FFTPaddingTypes.FAST`) ou até o bucket comum (`FFTPaddingTypes.BUCKET`).
+
+Para cada duração, o comprimento "pior caso" é o primo mais próximo de
+`duração * taxa * fator`; "smooth" é a potência de 2 mais próxima, como
+referência de melhor caso. No pior caso, a coluna "desvio" é a maior
+diferença absoluta para o resultado sem padding, relativa ao pico (o sinal
+é float32, como no pipeline).
+
+Uso:
+  python -m benchmarks.fft_lengths
+  python -m benchmarks.fft_lengths --durations 5 30 --iterations 50 --channels 2
+"""
+
+import argparse
+import json
+import time
+import numpy as np
+from benchmarks.signals import generate
+from src.fat.backend import get_backend
+from src.fat.io_handlers import PCM16_SCALE
+from src.fat.processing import fft_length, iterative_soft_thresholding
+from src.fat.types import BackendTypes, FFTPaddingTypes
+
+
+def _is_prime(n: int) -> bool:
+    if n < 2:
+        return False
+    for p in range(2, int(n**0.5) + 1):
+        if n % p == 0:
+            return False
+    return True
+
+
+def _nearest_prime(n: int) -> int:
+    while not _is_prime(n):
+        n += 1
+    return n
+
+
+def _largest_factor(n: int) -> int:
+    largest, p = 1, 2
+    while p * p <= n:
+        while n % p == 0:
+            largest, n = p, n // p
+        p += 1
+    return max(largest, n)
+
+
+def run(args: argparse.Namespace) -> list[dict]:
+    backend = get_backend(BackendTypes.NUMPY)
+    results = []
+    for duration in args.durations:
+        target = int(duration * args.sample_rate * args.factor)
+        lengths = {
+            "worst": _nearest_prime(target),
+            "smooth": 1 << round(np.log2(target)),
+        }
+        for label, n in lengths.items():
+            data = generate("music", n / args.sample_rate, args.sample_rate, 1)
+            data = np.resize(data[:, 0] * PCM16_SCALE, (n, args.channels))
+            unpadded = None
+            for padding in FFTPaddingTypes:
+                if label == "smooth" and padding != FFTPaddingTypes.NONE:
+                    continue
+                iterative_soft_thresholding(data, 1, 0.6, backend, padding=padding)
+                timings = []
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    output = iterative_soft_thresholding(
+                        data, args.iterations, 0.6, backend, padding=padding
+                    ).data
+                    timings.append(time.perf_counter() - start)
+                if padding == FFTPaddingTypes.NONE:
+                    unpadded = output
+                error = np.abs(output - unpadded).max() / np.abs(unpadded).max()
+                length = fft_length(n, padding)
+                seconds = min(timings)
+                result = {
+                    "duration": duration,
+                    "case": label,
+                    "padding": str(padding),
+                    "length": n,
+                    "fft_length": length,
+                    "largest_factor": _largest_factor(length),
+                    "seconds": seconds,
+                    "ms_per_iteration": 1e3 * seconds / args.iterations,
+                    "relative_error": float(error),
+                }
+                results.append(result)
+                print(
+                    f"{duration:>5g}s {label:<6} {str(padding):<6} n={n:<9} "
+                    f"fft={length:<9} p_max={result['largest_factor']:<9} "
+                    f"{result['ms_per_iteration']:9.2f} ms/it  "
+                    f"desvio {result['relative_error']:.1e}"
+                )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--durations", type=float, nargs="+", default=[2, 10])
+    parser.add_argument("--sample-rate", type=int, default=44_100)
+    parser.add_argument("--factor", type=int, default=4)
+    parser.add_argument("--channels", type=int, default=2)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", help="grava os resultados em JSON")
+    args = parser.parse_args()
+    results = run(args)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Resultados gravados em {args.out}")
@@ -0,0 +1,143 @@
+# benchmarks/interpolation.py
+"""
+Métodos de interpolação (`InterpolationTypes`): custo medido e iterações do
+IST até a qualidade.
+
+A referência é um sinal sintético gerado já na taxa de saída; a entrada é
+essa referência decimada por `--factor` (`resample_poly`). Para cada método:
+
+- custo: tempo da interpolação, operações do modelo (`interpolation_cost`)
+  e o coeficiente medido em ns por operação;
+- qualidade: SNR da saída de `process_channel` contra a referência (com
+  ganho ajustado por mínimos quadrados, como faz o autoscale) para cada
+  número de iterações da grade;
+- iterações até a qualidade: menor número de iterações da grade em que o
+  SNR alcança o alvo (`--target-db`; por padrão, `--margin-db` acima do SNR
+  do `repeat` com o menor número de iterações da grade, ou seja, a
+  qualidade do pipeline antigo). Com o limiar absoluto do IST, as iterações
+  não aumentam o SNR contra a referência (só o mantêm ou o reduzem), então
+  o alvo com margem separa os métodos: o `repeat` nunca o alcança, e quem o
+  alcança o faz na interpolação; "-" indica que o método não chega lá.
+
+Uso:
+  python -m benchmarks.interpolation
+  python -m benchmarks.interpolation --signals music --iterations 0 10 50 200
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Optional
+import numpy as np
+from scipy.signal import resample_poly
+from benchmarks.signals import SIGNALS, generate
+from src.fat.backend import get_backend
+from src.fat.interpolation import interpolate, interpolation_cost
+from src.fat.io_handlers import PCM16_SCALE
+from src.fat.processing import process_channel
+from src.fat.types import BackendTypes, InterpolationTypes
+
+
+def _snr_db(output: np.ndarray, reference: np.ndarray) -> float:
+    gain = np.dot(output, reference) / max(np.dot(output, output), 1e-30)
+    error = gain * output - reference
+    return float(10 * np.log10(np.sum(reference**2) / max(np.sum(error**2), 1e-30)))
+
+
+def _iterations_to(curve: dict[int, float], target: float) -> Optional[int]:
+    reached = [it for it, snr in sorted(curve.items()) if snr >= target - 0.01]
+    return reached[0] if reached else None
+
+
+def run_signal(signal: str, args: argparse.Namespace) -> list[dict[str, Any]]:
+    backend = get_backend(BackendTypes.NUMPY)
+    factor = args.factor
+    reference = generate(signal, args.duration, args.sample_rate * factor, 1)[:, 0]
+    low = resample_poly(reference.astype(np.float64), 1, factor).astype(np.float32)
+    low *= PCM16_SCALE
+    reference = reference[: len(low) * factor].astype(np.float64) * PCM16_SCALE
+    stereo = np.column_stack([low, low])
+
+    results = []
+    for method in InterpolationTypes:
+        interpolate(stereo, factor, method, backend)
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            interpolate(stereo, factor, method, backend)
+            timings.append(time.perf_counter() - start)
+        seconds = min(timings)
+        cost = interpolation_cost(method, len(stereo), 2, factor)
+        curve = {
+            iterations: _snr_db(
+                process_channel(
+                    low, factor, iterations, 0.6, backend, interpolation=method
+                ).data.astype(np.float64),
+                reference,
+            )
+            for iterations in args.iterations
+        }
+        results.append(
+            {
+                "signal": signal,
+                "method": str(method),
+                "seconds": seconds,
+                "taps": cost.taps,
+                "operations": cost.operations,
+                "ns_per_operation": 1e9 * seconds / cost.operations,
+                "snr_db": curve,
+            }
+        )
+    target = args.target_db
+    if target is None:
+        repeat = next(r for r in results if r["method"] == "repeat")["snr_db"]
+        target = repeat[min(repeat)] + args.margin_db
+    for result in results:
+        result["target_db"] = target
+        result["iterations_to_quality"] = _iterations_to(result["snr_db"], target)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--signals",
+        nargs="+",
+        default=[s for s in SIGNALS if s != "silence"],
+        choices=SIGNALS,
+    )
+    parser.add_argument("--duration", type=float, default=2.0)
+    parser.add_argument("--sample-rate", type=int, default=11_025)
+    parser.add_argument("--factor", type=int, default=4)
+    parser.add_argument(
+        "--iterations", type=int, nargs="+", default=[0, 10, 50, 100, 300]
+    )
+    parser.add_argument("--target-db", type=float)
+    parser.add_argument("--margin-db", type=float, default=3.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", help="grava os resultados em JSON")
+    args = parser.parse_args()
+
+    results = []
+    with np.errstate(all="ignore"):
+        for signal in args.signals:
+            for result in run_signal(signal, args):
+                results.append(result)
+                curve = " ".join(
+                    f"{it}:{snr:.1f}" for it, snr in result["snr_db"].items()
+                )
+                reached = result["iterations_to_quality"]
+                print(
+                    f"{signal:<6} {result['method']:<9} taps={result['taps']:<3} "
+                    f"{result['seconds'] * 1e3:8.2f} ms "
+                    f"{result['ns_per_operation']:6.2f} ns/op  "
+                    f"SNR[it:dB] {curve}  "
+                    f"alvo {result['target_db']:.1f} dB em "
+                    f"{'-' if reached is None else reached} it"
+                )
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Resultados gravados em {args.out}")
@@ -0,0 +1,150 @@
+# benchmarks/parity.py
+"""
+Paridade CPU/GPU: compara as saídas do `NumpyBackend` (referência) e do
+`CupyBackend` em reamostragem (`interpolate`, todos os métodos), IST (FFT
+real e complexa, com e sem padding), Block LMS,
+`normalize_signal` e `upscale_channels` (interpolação + IST, por método),
+com os mesmos sinais sintéticos.
+
+O erro é a maior diferença absoluta relativa ao pico da referência. O IST
+zera os coeficientes abaixo do limiar, então um bin no limite pode cair de
+um lado na CPU e do outro na GPU; por isso a tolerância é relativa ao pico
+e não elemento a elemento. Termina com código 1 se algum caso passar de
+`--tolerance` (padrão: 1e-6 em float64, 1e-3 em float32) e com código 0,
+sem comparar nada, se o CuPy não estiver disponível.
+
+Uso:
+  python -m benchmarks.parity
+  python -m benchmarks.parity --dtype float32 --iterations 50 --signals music
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Callable
+import numpy as np
+from benchmarks.signals import SIGNALS, generate
+from src.fat.backend import ArrayBackend, cupy_available, get_backend
+from src.fat.interpolation import interpolate
+from src.fat.io_handlers import PCM16_SCALE
+from src.fat.processing import (
+    iterative_soft_thresholding,
+    lms_filter,
+    normalize_signal,
+    upscale_channels,
+)
+from src.fat.types import (
+    BackendTypes,
+    FFTPaddingTypes,
+    InterpolationTypes,
+)
+
+_DEFAULT_TOLERANCE = {"float64": 1e-6, "float32": 1e-3}
+
+
+def _cases(
+    args: argparse.Namespace,
+) -> list[tuple[str, Callable[[Any, ArrayBackend], Any]]]:
+    cases: list[tuple[str, Callable[[Any, ArrayBackend], Any]]] = []
+    for method in InterpolationTypes:
+        cases.append(
+            (
+                f"interpolate/{method}",
+                lambda x, b, m=method: interpolate(x, args.factor, m, b),
+            )
+        )
+    for real_fft in (True, False):
+        for padding in (FFTPaddingTypes.NONE, FFTPaddingTypes.FAST):
+            name = f"ist/{'rfft' if real_fft else 'fft'}/{padding}"
+            cases.append(
+                (
+                    name,
+                    lambda x, b, r=real_fft, p=padding: iterative_soft_thresholding(
+                        x, args.iterations, 0.6, b, real_fft=r, padding=p
+                    ).data,
+                )
+            )
+    cases.append(("lms", lambda x, b: lms_filter(x[:, 0], x[:, 1], backend=b)))
+    cases.append(("normalize", lambda x, b: normalize_signal(x[:, 0], b)))
+    for method in InterpolationTypes:
+        cases.append(
+            (
+                f"upscale_channels/{method}",
+                lambda x, b, m=method: upscale_channels(
+                    x, args.factor, args.iterations, 0.6, b, interpolation=m
+                ).data,
+            )
+        )
+    return cases
+
+
+def compare(
+    signal: str,
+    args: argparse.Namespace,
+    reference: ArrayBackend,
+    candidate: ArrayBackend,
+) -> list[dict[str, Any]]:
+    data = generate(signal, args.duration, args.sample_rate, 2) * PCM16_SCALE
+    data = data.astype(args.dtype)
+    results = []
+    for name, fn in _cases(args):
+        expected = reference.asnumpy(fn(reference.asarray(data), reference))
+        actual = candidate.asnumpy(fn(candidate.asarray(data), candidate))
+        peak = float(np.abs(expected).max()) or 1.0
+        error = float(np.abs(actual.astype(np.float64) - expected).max()) / peak
+        results.append(
+            {
+                "signal": signal,
+                "case": name,
+                "dtype": str(actual.dtype),
+                "shape": list(actual.shape),
+                "relative_error": error,
+                "ok": actual.shape == expected.shape and error <= args.tolerance,
+            }
+        )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--signals",
+        nargs="+",
+        default=[s for s in SIGNALS if s != "silence"],
+        choices=SIGNALS,
+    )
+    parser.add_argument("--duration", type=float, default=1.0)
+    parser.add_argument("--sample-rate", type=int, default=11_025)
+    parser.add_argument("--factor", type=int, default=4)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--dtype", choices=list(_DEFAULT_TOLERANCE), default="float64")
+    parser.add_argument("--tolerance", type=float)
+    parser.add_argument("--out", help="grava os resultados em JSON")
+    args = parser.parse_args()
+    if args.tolerance is None:
+        args.tolerance = _DEFAULT_TOLERANCE[args.dtype]
+
+    if not cupy_available():
+        print("CuPy indisponível: paridade CPU/GPU não verificada.")
+        sys.exit(0)
+    reference = get_backend(BackendTypes.NUMPY)
+    candidate = get_backend(BackendTypes.CUPY)
+
+    results, failures = [], 0
+    with np.errstate(all="ignore"):
+        for signal in args.signals:
+            for result in compare(signal, args, reference, candidate):
+                results.append(result)
+                failures += not result["ok"]
+                print(
+                    f"{'ok' if result['ok'] else 'FALHA':<5} {signal:<6} "
+                    f"{result['case']:<28} {result['dtype']:<7} "
+                    f"erro {result['relative_error']:.1e}"
+                )
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Resultados gravados em {args.out}")
+    sys.exit(1 if failures else 0)
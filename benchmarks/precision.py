@@ -0,0 +1,111 @@
+# benchmarks/precision.py
+"""
+Precisão float32 contra a referência float64 (`UpscaleConfig.precision`)
+na cadeia de DSP completa: interpolação, IST, autoscale, normalização e LMS.
+
+Para cada sinal, mede o maior erro absoluto da saída float32 em dBFS, a
+relação sinal/erro e o tempo de cada precisão. Termina com código 1 se
+algum erro passar de `--max-error-db`; o padrão (-90 dBFS) fica abaixo do
+ruído de quantização de uma fonte de 16 bits.
+
+O sinal "silence" fica fora do padrão: a normalização de um canal nulo
+resulta em NaN nas duas precisões.
+
+Uso:
+  python -m benchmarks.precision
+  python -m benchmarks.precision --signals music --durations 10 --iterations 300
+"""
+
+import argparse
+import json
+import sys
+import time
+import numpy as np
+from benchmarks.signals import SIGNALS, generate
+from src.fat.backend import get_backend
+from src.fat.config import UpscaleConfig, working_dtype
+from src.fat.io_handlers import PCM16_SCALE
+from src.fat.pipeline import process_channels
+from src.fat.types import AudioTypes, BackendTypes, PrecisionTypes
+
+
+def _db(value: float) -> float:
+    return 20 * np.log10(value) if value > 0 else -np.inf
+
+
+def compare_precisions(
+    signal: str, duration: float, args: argparse.Namespace
+) -> dict[str, object]:
+    backend = get_backend(BackendTypes.NUMPY)
+    data = generate(signal, duration, args.sample_rate, args.channels) * PCM16_SCALE
+    outputs, seconds = {}, {}
+    for precision in PrecisionTypes:
+        cfg = UpscaleConfig(
+            input_file_path="",
+            output_file_path="",
+            source_format=AudioTypes.WAV,
+            target_format=AudioTypes.FLAC,
+            max_iterations=args.iterations,
+            precision=precision,
+        )
+        channels = backend.asarray(data, dtype=working_dtype(cfg, backend.xp))
+        start = time.perf_counter()
+        upscaled, _, _ = process_channels(channels, cfg, args.factor, backend)
+        seconds[str(precision)] = time.perf_counter() - start
+        outputs[precision] = backend.asnumpy(upscaled)
+    reference = outputs[PrecisionTypes.FLOAT64]
+    single = outputs[PrecisionTypes.FLOAT32]
+    error = single.astype(np.float64) - reference
+    max_error = float(np.abs(error).max())
+    signal_power = float(np.mean(reference**2))
+    error_power = float(np.mean(error**2))
+    return {
+        "signal": signal,
+        "duration": duration,
+        "dtype": str(single.dtype),
+        "max_error": max_error,
+        "max_error_dbfs": _db(max_error),
+        "snr_db": 10 * np.log10(signal_power / error_power) if error_power else np.inf,
+        "seconds": seconds,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--signals",
+        nargs="+",
+        default=[s for s in SIGNALS if s != "silence"],
+        choices=SIGNALS,
+    )
+    parser.add_argument("--durations", type=float, nargs="+", default=[2])
+    parser.add_argument("--sample-rate", type=int, default=44_100)
+    parser.add_argument("--channels", type=int, default=2)
+    parser.add_argument("--factor", type=int, default=4)
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--max-error-db", type=float, default=-90.0)
+    parser.add_argument("--out", help="grava os resultados em JSON")
+    args = parser.parse_args()
+
+    results, failures = [], 0
+    with np.errstate(all="ignore"):
+        for signal in args.signals:
+            for duration in args.durations:
+                result = compare_precisions(signal, duration, args)
+                results.append(result)
+                ok = result["max_error_dbfs"] <= args.max_error_db
+                failures += not ok
+                print(
+                    f"{'ok' if ok else 'FALHA':<5} {signal:<7} {duration:>5g}s "
+                    f"{result['dtype']:<7} erro máx {result['max_error_dbfs']:7.1f} dBFS  "
+                    f"SNR {result['snr_db']:6.1f} dB  "
+                    f"float32 {result['seconds']['float32']:6.2f} s  "
+                    f"float64 {result['seconds']['float64']:6.2f} s"
+                )
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Resultados gravados em {args.out}")
+    sys.exit(1 if failures else 0)
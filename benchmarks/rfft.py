@@ -0,0 +1,52 @@
+# benchmarks/rfft.py
+"""
+Compara o IST com FFT complexa (fft/ifft) e com FFT real (rfft/irfft).
+
+Uso: python -m benchmarks.rfft --length 441000 --iterations 50
+"""
+
+import argparse
+import time
+import numpy as np
+from src.fat.backend import get_backend
+from src.fat.processing import iterative_soft_thresholding
+from src.fat.types import BackendTypes
+
+
+def run(length: int, iterations: int, threshold: float, backend_name: str) -> None:
+    backend = get_backend(BackendTypes[backend_name.upper()])
+    rng = np.random.default_rng(0)
+    data = backend.asarray(rng.standard_normal(length).astype(np.float32) * 3000)
+
+    results = {}
+    for label, real_fft in (("fft/ifft", False), ("rfft/irfft", True)):
+        iterative_soft_thresholding(data, 1, threshold, backend, real_fft=real_fft)
+        backend.synchronize()
+        start = time.perf_counter()
+        out = iterative_soft_thresholding(
+            data, iterations, threshold, backend, real_fft=real_fft
+        )
+        backend.synchronize()
+        elapsed = time.perf_counter() - start
+        results[label] = backend.asnumpy(out.data)
+        print(
+            f"{label:>10}: {elapsed:8.3f} s  "
+            f"({elapsed / iterations * 1e3:.2f} ms/iteração)"
+        )
+
+    reference = results["fft/ifft"]
+    diff = np.max(np.abs(reference - results["rfft/irfft"]))
+    peak = np.max(np.abs(reference))
+    print(
+        f"Diferença máxima absoluta: {diff:.3e} (relativa ao pico: {diff / peak:.3e})"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--length", type=int, default=44_100 * 10)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--threshold", type=float, default=0.6)
+    parser.add_argument("--backend", default="auto", choices=["auto", "numpy", "cupy"])
+    args = parser.parse_args()
+    run(args.length, args.iterations, args.threshold, args.backend)
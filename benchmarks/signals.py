@@ -0,0 +1,54 @@
+# benchmarks/signals.py
+"""
+Sinais sintéticos determinísticos para os benchmarks, em float32 [-1, 1]
+com forma (n, canais).
+"""
+
+import numpy as np
+
+SIGNALS = ("tone", "noise", "silence", "music")
+
+
+def _tone(t: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    return 0.4 * np.sin(2 * np.pi * 440 * t) + 0.2 * np.sin(2 * np.pi * 880 * t)
+
+
+def _noise(t: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    return 0.25 * rng.standard_normal(len(t))
+
+
+def _silence(t: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    return np.zeros(len(t))
+
+
+def _music(t: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Acordes com parciais harmônicos (amplitude ~1/k), envelope e ruído rosa."""
+    out = np.zeros(len(t))
+    for i, root in enumerate((110.0, 146.83, 164.81, 196.0)):
+        partials = sum(np.sin(2 * np.pi * root * k * t) / k for k in range(1, 12))
+        gate = (np.floor(t * 2) % 4 == i).astype(float)
+        out += partials * gate * np.exp(-3 * (t * 2 % 1))
+    spectrum = np.fft.rfft(rng.standard_normal(len(t)))
+    spectrum /= np.sqrt(np.arange(1, len(spectrum) + 1))
+    pink = np.fft.irfft(spectrum, n=len(t))
+    out += 0.5 * pink / max(1e-9, np.abs(pink).max())
+    return 0.9 * out / max(1e-9, np.abs(out).max())
+
+
+def generate(kind: str, seconds: float, sample_rate: int, channels: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    match kind:
+        case "tone":
+            make = _tone
+        case "noise":
+            make = _noise
+        case "silence":
+            make = _silence
+        case "music":
+            make = _music
+        case _:
+            raise ValueError(f"Sinal sintético desconhecido: {kind}")
+    # Canais levemente diferentes, como um estéreo real.
+    data = np.column_stack([make(t + c * 1e-3, rng) for c in range(channels)])
+    return np.clip(data, -1, 1).astype(np.float32)
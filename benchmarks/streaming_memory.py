@@ -0,0 +1,110 @@
+# benchmarks/streaming_memory.py
+"""
+Mede o pico de RSS do upscaling em fluxo para durações crescentes de entrada.
+
+Cada execução roda em um processo separado, para que o pico de RSS de uma
+não contamine a outra. Com o modo em fluxo, o pico deve ficar estável quando
+a duração dobra: termina com código 1 se o pico de alguma duração passar o
+da menor em mais de `--max-growth` (fração; 10% por padrão).
+
+Uso: python -m benchmarks.streaming_memory --durations 30 60 120
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import numpy as np
+import soundfile as sf
+
+
+def generate_input(path: str, seconds: float, sample_rate: int) -> None:
+    rng = np.random.default_rng(0)
+    block = sample_rate * 10
+    with sf.SoundFile(
+        path, "w", samplerate=sample_rate, channels=2, subtype="PCM_16"
+    ) as f:
+        remaining = int(seconds * sample_rate)
+        while remaining > 0:
+            n = min(block, remaining)
+            t = np.arange(n) / sample_rate
+            tone = 0.3 * np.sin(2 * np.pi * 440 * t)[:, np.newaxis]
+            f.write(tone + 0.05 * rng.standard_normal((n, 2)))
+            remaining -= n
+
+
+def run_child(input_path: str, output_path: str, streaming: bool, iterations: int):
+    from src.fat.config import UpscaleConfig
+    from src.fat.pipeline import upscale
+    from src.fat.types import AudioTypes
+
+    upscale(
+        UpscaleConfig(
+            input_file_path=input_path,
+            output_file_path=output_path,
+            source_format=AudioTypes.WAV,
+            target_format=AudioTypes.FLAC,
+            max_iterations=iterations,
+            target_bitrate_kbps=1411,
+            streaming=streaming,
+        )
+    )
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(peak_kb)
+
+
+def measure(input_path: str, streaming: bool, iterations: int) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        output_path = os.path.join(tmp, "out.flac")
+        out = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.streaming_memory",
+                "--child",
+                input_path,
+                output_path,
+                str(int(streaming)),
+                str(iterations),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+    return int(out.stdout.strip().splitlines()[-1]) / 1024
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        _, _, input_path, output_path, streaming, iterations = sys.argv
+        run_child(input_path, output_path, bool(int(streaming)), int(iterations))
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--durations", type=float, nargs="+", default=[30, 60, 120])
+    parser.add_argument("--sample-rate", type=int, default=11_025)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--max-growth", type=float, default=0.1)
+    parser.add_argument(
+        "--with-full", action="store_true", help="mede também o modo não-streaming"
+    )
+    args = parser.parse_args()
+
+    baseline, failures = None, 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for seconds in sorted(args.durations):
+            input_path = os.path.join(tmp, f"in_{seconds:g}.wav")
+            generate_input(input_path, seconds, args.sample_rate)
+            peak = measure(input_path, True, args.iterations)
+            baseline = baseline or peak
+            ok = peak <= baseline * (1 + args.max_growth)
+            failures += not ok
+            line = f"{'ok' if ok else 'FALHA':<5} {seconds:8.1f} s: streaming {peak:8.1f} MB"
+            if args.with_full:
+                line += (
+                    f" | completo {measure(input_path, False, args.iterations):8.1f} MB"
+                )
+            print(line)
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,321 @@
+# benchmarks/suite.py
+"""
+Suíte de benchmarks por estágio (micro) e ponta a ponta (macro), offline e
+em CPU, com sinais sintéticos (ver `benchmarks.signals`).
+
+Cada caso roda em um processo novo; o pico de RSS informado é o acréscimo
+sobre o processo já com o sinal de entrada pronto, ou seja, o que o estágio
+alocou. Os resultados (tempo, pico de RSS, amostras/s) são gravados em JSON.
+Os estágios depois da interpolação partem da saída do método configurado
+(`UpscaleConfig.interpolation`), registrado em cada caso.
+
+Uso:
+  python -m benchmarks.suite run --out base.json
+  python -m benchmarks.suite run --stages ist lms --durations 5 --iterations 100
+  python -m benchmarks.suite e2e --out e2e.json --durations 10 30
+  python -m benchmarks.suite compare base.json novo.json --tolerance 0.1
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable
+import numpy as np
+import soundfile as sf
+from benchmarks.signals import SIGNALS, generate
+
+STAGES = ("interpolation", "ist", "lms", "normalize", "read_audio", "write_audio")
+
+# Parâmetros da grade que afetam cada estágio; os demais são ignorados para
+# não repetir casos idênticos.
+_STAGE_PARAMS: dict[str, tuple[str, ...]] = {
+    "interpolation": ("factor",),
+    "ist": ("factor", "iterations"),
+    "lms": ("factor",),
+    "normalize": ("factor",),
+    "read_audio": (),
+    "write_audio": ("factor",),
+    "upscale": ("factor", "iterations", "streaming"),
+}
+_KEY_FIELDS = (
+    "stage",
+    "signal",
+    "duration",
+    "channels",
+    "factor",
+    "iterations",
+    "streaming",
+)
+
+
+def _peak_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _stage_runner(case: dict[str, Any], tmp: str) -> tuple[Callable[[], Any], int]:
+    """Prepara as entradas do estágio e devolve (função medida, amostras processadas)."""
+    from src.fat.backend import get_backend
+    from src.fat.config import UpscaleConfig
+    from src.fat.io_handlers import PCM16_SCALE, read_audio, write_audio
+    from src.fat.pipeline import upscale
+    from src.fat.processing import (
+        iterative_soft_thresholding,
+        lms_filter,
+        normalize_signal,
+    )
+    from src.fat.interpolation import interpolate
+    from src.fat.types import AudioTypes, BackendTypes, InterpolationTypes
+
+    backend = get_backend(BackendTypes.NUMPY)
+    sample_rate, factor = case["sample_rate"], case["factor"]
+    data = generate(case["signal"], case["duration"], sample_rate, case["channels"])
+    input_path = os.path.join(tmp, "in.wav")
+    output_path = os.path.join(tmp, "out.flac")
+    match case["stage"]:
+        case "read_audio":
+            sf.write(input_path, data, sample_rate, subtype="PCM_16")
+            return (lambda: read_audio(input_path, AudioTypes.WAV)), data.size
+        case "upscale":
+            sf.write(input_path, data, sample_rate, subtype="PCM_16")
+            cfg = UpscaleConfig(
+                input_file_path=input_path,
+                output_file_path=output_path,
+                source_format=AudioTypes.WAV,
+                target_format=AudioTypes.FLAC,
+                max_iterations=case["iterations"],
+                source_bitrate_kbps=1411 / factor,
+                backend=BackendTypes.NUMPY,
+                streaming=case["streaming"],
+            )
+            return (lambda: upscale(cfg)), data.size
+    scaled = data * PCM16_SCALE
+    method = InterpolationTypes[case["interpolation"]]
+    if case["stage"] == "interpolation":
+        return (lambda: interpolate(scaled, factor, method, backend)), (
+            scaled.size * factor
+        )
+    expanded = interpolate(scaled, factor, method, backend)
+    match case["stage"]:
+        case "ist":
+            run = lambda: iterative_soft_thresholding(
+                expanded, case["iterations"], 0.6, backend
+            )
+            return run, expanded.size * case["iterations"]
+        case "lms":
+            run = lambda: [
+                lms_filter(expanded[:, c], expanded[:, c], backend=backend)
+                for c in range(expanded.shape[1])
+            ]
+            return run, expanded.size
+        case "normalize":
+            run = lambda: [
+                normalize_signal(expanded[:, c], backend)
+                for c in range(expanded.shape[1])
+            ]
+            return run, expanded.size
+        case "write_audio":
+            upscaled = expanded / PCM16_SCALE
+            run = lambda: write_audio(
+                output_path, sample_rate * factor, upscaled, AudioTypes.FLAC
+            )
+            return run, upscaled.size
+    raise ValueError(f"Estágio desconhecido: {case['stage']}")
+
+
+def run_child(case: dict[str, Any]) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp, np.errstate(all="ignore"):
+        run, samples = _stage_runner(case, tmp)
+        baseline = _peak_rss_bytes()
+        timings = []
+        for _ in range(case["repeat"]):
+            start = time.perf_counter()
+            result = run()
+            timings.append(time.perf_counter() - start)
+            del result
+        peak = _peak_rss_bytes()
+    seconds = min(timings)
+    return {
+        **case,
+        "seconds": seconds,
+        "seconds_all": timings,
+        "peak_rss_bytes": max(0, peak - baseline),
+        "samples": samples,
+        "samples_per_second": samples / seconds if seconds > 0 else None,
+        "realtime_factor": case["duration"] / seconds if seconds > 0 else None,
+    }
+
+
+def measure(case: dict[str, Any]) -> dict[str, Any]:
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.suite", "--child", json.dumps(case)],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def build_cases(args: argparse.Namespace, stages: tuple[str, ...]) -> list[dict]:
+    from src.fat.config import UpscaleConfig
+
+    grid = {
+        "factor": args.factors,
+        "iterations": args.iterations,
+        "streaming": [args.streaming] if hasattr(args, "streaming") else [False],
+    }
+    cases, seen = [], set()
+    for stage in stages:
+        relevant = _STAGE_PARAMS[stage]
+        for signal, duration, channels, *values in itertools.product(
+            args.signals,
+            args.durations,
+            args.channels,
+            *(grid[name] for name in relevant),
+        ):
+            case = {
+                "stage": stage,
+                "signal": signal,
+                "duration": duration,
+                "channels": channels,
+                "factor": 1,
+                "iterations": 0,
+                "streaming": False,
+                "interpolation": UpscaleConfig.interpolation.name,
+                "sample_rate": args.sample_rate,
+                "repeat": args.repeat,
+                **dict(zip(relevant, values)),
+            }
+            key = case_key(case)
+            if key not in seen:
+                seen.add(key)
+                cases.append(case)
+    return cases
+
+
+def case_key(result: dict[str, Any]) -> tuple:
+    return tuple(result.get(name) for name in _KEY_FIELDS)
+
+
+def _metadata() -> dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_suite(args: argparse.Namespace, stages: tuple[str, ...]) -> None:
+    cases = build_cases(args, stages)
+    results = []
+    for i, case in enumerate(cases, 1):
+        result = measure(case)
+        results.append(result)
+        print(
+            f"[{i}/{len(cases)}] {case['stage']:<13} {case['signal']:<7} "
+            f"{case['duration']:>5g}s {case['channels']}ch x{case['factor']:<2} "
+            f"it={case['iterations']:<4} {result['seconds']:8.3f} s  "
+            f"{result['peak_rss_bytes'] / 2**20:8.1f} MB  "
+            f"{(result['samples_per_second'] or 0) / 1e6:8.2f} Mamostras/s"
+        )
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({"meta": _metadata(), "results": results}, f, indent=2)
+    print(f"Resultados gravados em {args.out}")
+
+
+def compare(base_path: str, new_path: str, tolerance: float, min_seconds: float) -> int:
+    """Compara dois arquivos de resultados; retorna 1 se houver regressão."""
+    with open(base_path, encoding="utf-8") as f:
+        base = {case_key(r): r for r in json.load(f)["results"]}
+    with open(new_path, encoding="utf-8") as f:
+        new = {case_key(r): r for r in json.load(f)["results"]}
+    regressions = 0
+    for key in sorted(base.keys() & new.keys(), key=str):
+        old, cur = base[key], new[key]
+        flags = []
+        if old["seconds"] >= min_seconds and cur["seconds"] > old["seconds"] * (
+            1 + tolerance
+        ):
+            flags.append(f"tempo {old['seconds']:.3f} → {cur['seconds']:.3f} s")
+        old_mb, cur_mb = old["peak_rss_bytes"] / 2**20, cur["peak_rss_bytes"] / 2**20
+        if cur_mb > max(old_mb * (1 + tolerance), old_mb + 1):
+            flags.append(f"RSS {old_mb:.1f} → {cur_mb:.1f} MB")
+        ratio = cur["seconds"] / old["seconds"] if old["seconds"] else float("nan")
+        status = "REGRESSÃO" if flags else "ok"
+        print(
+            f"{status:<9} {' '.join(str(k) for k in key):<55} {ratio:6.2f}x "
+            + "; ".join(flags)
+        )
+        regressions += bool(flags)
+    for key in sorted(base.keys() - new.keys(), key=str):
+        print(f"ausente   {' '.join(str(k) for k in key)}")
+    print(f"{regressions} regressão(ões) com tolerância de {tolerance:.0%}")
+    return 1 if regressions else 0
+
+
+def _add_grid_arguments(parser: argparse.ArgumentParser, durations: list[float]):
+    parser.add_argument("--out", default="benchmarks.json")
+    parser.add_argument("--signals", nargs="+", default=list(SIGNALS), choices=SIGNALS)
+    parser.add_argument("--durations", type=float, nargs="+", default=durations)
+    parser.add_argument("--channels", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--factors", type=int, nargs="+", default=[4])
+    parser.add_argument("--iterations", type=int, nargs="+", default=[50])
+    parser.add_argument("--sample-rate", type=int, default=44_100)
+    parser.add_argument("--repeat", type=int, default=3)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        print(json.dumps(run_child(json.loads(sys.argv[2]))))
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    micro = commands.add_parser("run", help="benchmarks por estágio")
+    _add_grid_arguments(micro, [2, 10])
+    micro.add_argument("--stages", nargs="+", default=list(STAGES), choices=STAGES)
+    macro = commands.add_parser("e2e", help="upscale() em arquivos gerados")
+    _add_grid_arguments(macro, [10])
+    macro.add_argument("--streaming", action="store_true")
+    diff = commands.add_parser("compare", help="compara dois arquivos de resultados")
+    diff.add_argument("base")
+    diff.add_argument("new")
+    diff.add_argument("--tolerance", type=float, default=0.10)
+    diff.add_argument(
+        "--min-seconds",
+        type=float,
+        default=0.005,
+        help="ignora variação de tempo em casos mais curtos que isto",
+    )
+    args = parser.parse_args()
+
+    match args.command:
+        case "run":
+            run_suite(args, tuple(args.stages))
+        case "e2e":
+            args.repeat = 1
+            run_suite(args, ("upscale",))
+        case "compare":
+            sys.exit(compare(args.base, args.new, args.tolerance, args.min_seconds))
@@ -0,0 +1,143 @@
+# benchmarks/tagging.py
+"""
+E/S da etapa de tags no FLAC: bytes regravados para gravar título, ID do
+vídeo e capa depois da codificação.
+
+Cada modo codifica o mesmo sinal com `ChunkedAudioWriter` e chama
+`tag_flac` em seguida:
+
+- sem reserva: como antes, o cabeçalho do libsndfile não tem espaço para a
+  capa e o mutagen desloca o áudio, reescrevendo o arquivo inteiro;
+- reservado: o writer reserva `metadata_reserve_bytes` no cabeçalho
+  (`OutputMetadata`) e as tags ocupam esse espaço no lugar;
+- retag: uma segunda gravação de tags (outro título, sem capa) sobre o
+  arquivo reservado, como no `JobPlan.RETAG`.
+
+Os bytes regravados são contados comparando o arquivo antes e depois das
+tags, posição a posição, mais a variação de tamanho. O mutagen desloca o
+áudio com `mmap`, que escapa de contadores como o `wchar` de /proc. Termina
+com código 1 se algum modo com reserva mover o áudio.
+
+Uso:
+  python -m benchmarks.tagging
+  python -m benchmarks.tagging --duration 60 --cover-kb 400 --out tags.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Optional
+import numpy as np
+from benchmarks.signals import generate
+from src.fat.backend import get_backend
+from src.fat.types import AudioTypes, BackendTypes, OutputMetadata
+from src.fat.writer import ChunkedAudioWriter
+from src.process_pipeline import metadata_reserve_bytes, tag_flac
+from src.types import CoverArt
+
+
+def _audio_offset(path: str) -> int:
+    """Posição do primeiro quadro de áudio (fim dos blocos de metadados)."""
+    with open(path, "rb") as f:
+        if f.read(4) != b"fLaC":
+            raise ValueError(f"Não é um FLAC: {path}")
+        while True:
+            header = f.read(4)
+            f.seek(int.from_bytes(header[1:], "big"), os.SEEK_CUR)
+            if header[0] & 0x80:
+                return f.tell()
+
+
+def _rewritten_bytes(before: bytes, after: bytes) -> int:
+    common = min(len(before), len(after))
+    a = np.frombuffer(before, dtype=np.uint8, count=common)
+    b = np.frombuffer(after, dtype=np.uint8, count=common)
+    return int(np.count_nonzero(a != b)) + abs(len(after) - len(before))
+
+
+def _tag(
+    path: str, title: str, cover: Optional[CoverArt], video_id: str
+) -> dict[str, object]:
+    with open(path, "rb") as f:
+        before = f.read()
+    offset = _audio_offset(path)
+    start = time.perf_counter()
+    tag_flac(path, title, cover, video_id)
+    seconds = time.perf_counter() - start
+    with open(path, "rb") as f:
+        after = f.read()
+    return {
+        "file_bytes": len(after),
+        "rewritten_bytes": _rewritten_bytes(before, after),
+        "audio_moved": _audio_offset(path) != offset,
+        "tag_seconds": seconds,
+    }
+
+
+def run(args: argparse.Namespace) -> list[dict[str, object]]:
+    backend = get_backend(BackendTypes.NUMPY)
+    data = generate("music", args.duration, args.sample_rate, 2)
+    rng = np.random.default_rng(0)
+    cover = CoverArt(rng.bytes(args.cover_kb * 1024), "image/jpeg")
+    title, video_id = "Faixa de teste", "dQw4w9WgXcQ"
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode, metadata in (
+            ("sem reserva", None),
+            ("reservado", OutputMetadata(title, metadata_reserve_bytes(cover))),
+        ):
+            path = os.path.join(tmp, f"{mode.replace(' ', '_')}.flac")
+            start = time.perf_counter()
+            with ChunkedAudioWriter(
+                path,
+                args.sample_rate,
+                2,
+                AudioTypes.FLAC,
+                backend,
+                metadata=metadata,
+            ) as writer:
+                writer.write(data)
+            encode_seconds = time.perf_counter() - start
+            results.append(
+                {
+                    "mode": mode,
+                    "encode_seconds": encode_seconds,
+                    **_tag(path, title, cover, video_id),
+                }
+            )
+            if metadata is not None:
+                results.append(
+                    {"mode": "retag", **_tag(path, "Outro título", None, video_id)}
+                )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--sample-rate", type=int, default=176_400)
+    parser.add_argument("--cover-kb", type=int, default=300)
+    parser.add_argument("--out", help="grava os resultados em JSON")
+    args = parser.parse_args()
+
+    results = run(args)
+    failures = 0
+    for result in results:
+        moved = result["audio_moved"]
+        failures += moved and result["mode"] != "sem reserva"
+        print(
+            f"{result['mode']:<12} arquivo {result['file_bytes'] / 2**20:8.2f} MiB  "
+            f"regravados {result['rewritten_bytes'] / 2**20:8.3f} MiB  "
+            f"áudio {'deslocado' if moved else 'no lugar':<9}  "
+            f"tags {result['tag_seconds'] * 1e3:7.1f} ms"
+        )
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Resultados gravados em {args.out}")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,124 @@
+# src/cache.py
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+from src.fat.pcm_cache import source_digest
+
+_INFO_FILE = "info.json"
+
+
+@dataclass(frozen=True, slots=True)
+class CacheEntry:
+    path: Path
+    info: dict[str, Any]
+    audio_path: Path
+
+
+def settings_key(options: dict[str, Any]) -> str:
+    """Hash estável das opções que alteram o arquivo baixado (formato, pós-processadores)."""
+    relevant = {k: options.get(k) for k in ("format", "postprocessors")}
+    payload = json.dumps(relevant, sort_keys=True, default=str).encode()
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+class DownloadCache:
+    """
+    Cache local de downloads endereçado pelo ID do vídeo e pelas opções do
+    yt-dlp. Cada entrada é um diretório com o áudio e o info-dict; o acesso é
+    registrado no mtime do info.json e a remoção é LRU pelo total de bytes.
+    O sha256 do áudio fica em `_source_hash` no info-dict, calculado uma vez
+    por entrada.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def entry_dir(self, video_id: str, options: dict[str, Any]) -> Path:
+        return self.cache_dir / f"{video_id}-{settings_key(options)}"
+
+    def get(self, video_id: str, options: dict[str, Any]) -> Optional[CacheEntry]:
+        entry = self.entry_dir(video_id, options)
+        info_path = entry / _INFO_FILE
+        try:
+            info = json.loads(info_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        audio_path = entry / info.get("_cached_audio", "")
+        if not audio_path.is_file():
+            return None
+        if "_source_hash" not in info:
+            # Entrada gravada antes do hash: calculado uma vez e persistido.
+            info["_source_hash"] = source_digest(str(audio_path))
+            self._write_info(entry, info)
+        now = time.time()
+        os.utime(info_path, (now, now))
+        return CacheEntry(path=entry, info=info, audio_path=audio_path)
+
+    def staging_dir(self) -> Path:
+        """Diretório temporário dentro do cache, para que `put` seja um rename atômico."""
+        return Path(tempfile.mkdtemp(prefix=".tmp-", dir=self.cache_dir))
+
+    def put(
+        self,
+        video_id: str,
+        options: dict[str, Any],
+        staging: Path,
+        audio_path: Path,
+        info: dict[str, Any],
+    ) -> CacheEntry:
+        entry = self.entry_dir(video_id, options)
+        info = {
+            **info,
+            "_cached_audio": audio_path.relative_to(staging).as_posix(),
+            "_source_hash": source_digest(str(audio_path)),
+        }
+        self._write_info(staging, info)
+        with self._lock:
+            if entry.exists():
+                shutil.rmtree(staging, ignore_errors=True)
+            else:
+                os.replace(staging, entry)
+            self.evict(keep=entry)
+        cached = self.get(video_id, options)
+        if cached is None:
+            raise OSError(f"Falha ao gravar entrada de cache: {entry}")
+        return cached
+
+    def _write_info(self, entry: Path, info: dict[str, Any]) -> None:
+        info_path = entry / _INFO_FILE
+        tmp = info_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(
+            json.dumps(info, ensure_ascii=False, default=str), encoding="utf-8"
+        )
+        os.replace(tmp, info_path)
+
+    def evict(self, keep: Optional[Path] = None) -> None:
+        entries = []
+        total = 0
+        for entry in self.cache_dir.iterdir():
+            if not entry.is_dir() or entry.name.startswith(".tmp-"):
+                continue
+            size = sum(f.stat().st_size for f in entry.rglob("*") if f.is_file())
+            try:
+                last_access = (entry / _INFO_FILE).stat().st_mtime
+            except OSError:
+                last_access = 0.0
+            entries.append((last_access, size, entry))
+            total += size
+        for _, size, entry in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            if entry == keep:
+                continue
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
@@ -0,0 +1,329 @@
+# src/cli.py
+import argparse
+import csv
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Final, Iterator, Optional, Sequence
+from tqdm import tqdm
+from src.executor import StageFailure, StagedRunReport
+from src.playlist import expand_links
+from src.process_pipeline import DEFAULT_UPSCALE_SETTINGS, process_youtube_links
+from src.types import DownloadCacheConfig, DownloadMode, ExecutorConfig, LinkJob
+from .fat.tracing import configure_tracing
+from .fat.types import (
+    AudioTypes,
+    BackendTypes,
+    FFTPaddingTypes,
+    InterpolationTypes,
+    PrecisionTypes,
+)
+
+_STAGES: Final[tuple[str, ...]] = ("download", "thumbnail", "decode", "dsp", "writer")
+_URL_FIELDS: Final[tuple[str, ...]] = ("url", "link", "webpage_url", "URL")
+
+
+def _links_from_records(records: Sequence[Any]) -> Iterator[str]:
+    for record in records:
+        if isinstance(record, str):
+            yield record
+        elif isinstance(record, dict):
+            url = next((record[k] for k in _URL_FIELDS if record.get(k)), None)
+            if url:
+                yield url
+
+
+def read_links(source: str) -> Iterator[str]:
+    """
+    Links de um arquivo (`-` para stdin): texto com um link por linha (`#`
+    comenta), CSV com coluna url/link, ou JSON com lista de links/objetos.
+    """
+    if source == "-":
+        lines: Sequence[str] = sys.stdin.read().splitlines()
+    else:
+        path = Path(source)
+        match path.suffix.lower():
+            case ".json":
+                data = json.loads(path.read_text(encoding="utf-8"))
+                yield from _links_from_records(
+                    data.get("entries", []) if isinstance(data, dict) else data
+                )
+                return
+            case ".csv":
+                with path.open(newline="", encoding="utf-8") as f:
+                    rows = list(csv.reader(f))
+                if not rows:
+                    return
+                header = rows[0]
+                column = next(
+                    (header.index(k) for k in _URL_FIELDS if k in header), None
+                )
+                if column is None:
+                    yield from (
+                        row[0] for row in rows if row and row[0].startswith("http")
+                    )
+                else:
+                    yield from (
+                        row[column]
+                        for row in rows[1:]
+                        if len(row) > column and row[column]
+                    )
+                return
+            case _:
+                lines = path.read_text(encoding="utf-8").splitlines()
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line
+
+
+_OUTPUT_FORMATS: Final[tuple[AudioTypes, ...]] = (
+    AudioTypes.FLAC,
+    AudioTypes.OPUS,
+    AudioTypes.WAV,
+)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="youtube2opus",
+        description=(
+            "Baixa áudios do YouTube, aplica super-resolução e salva em FLAC ou Opus."
+        ),
+    )
+    parser.add_argument("urls", nargs="*", help="links de vídeos, playlists ou canais")
+    parser.add_argument(
+        "-i",
+        "--input",
+        action="append",
+        default=[],
+        help="arquivo de links (txt/csv/json) ou - para stdin",
+    )
+    parser.add_argument("-o", "--output-dir", default="./output")
+    parser.add_argument(
+        "--native",
+        action="store_true",
+        help="mantém o stream original, sem MP3 intermediário",
+    )
+    parser.add_argument("--cache-dir", help="cache de downloads")
+    parser.add_argument("--cache-max-gb", type=float, default=20.0)
+    parser.add_argument(
+        "--trace", help="grava spans por estágio (JSON lines) neste arquivo"
+    )
+    parser.add_argument(
+        "--profile", metavar="VIDEO_ID", help="perfila o processamento deste vídeo"
+    )
+    parser.add_argument("--profile-dir", default="./profiles")
+
+    workers = parser.add_argument_group("concorrência")
+    defaults = ExecutorConfig()
+    workers.add_argument(
+        "--download-workers", type=int, default=defaults.download_workers
+    )
+    workers.add_argument(
+        "--thumbnail-workers", type=int, default=defaults.thumbnail_workers
+    )
+    workers.add_argument("--decode-workers", type=int, default=defaults.decode_workers)
+    workers.add_argument("--dsp-workers", type=int, default=defaults.dsp_workers)
+    workers.add_argument("--writer-workers", type=int, default=defaults.writer_workers)
+    workers.add_argument("--queue-size", type=int, default=defaults.queue_size)
+
+    output = parser.add_argument_group("saída")
+    output.add_argument("--format", choices=[str(t) for t in _OUTPUT_FORMATS])
+    output.add_argument("--opus-bitrate", type=int, dest="opus_bitrate_kbps")
+    output.add_argument("--opus-complexity", type=int)
+    output.add_argument(
+        "--opus-frame-ms", type=float, help="2.5, 5, 10, 20, 40, 60, 80, 100 ou 120"
+    )
+
+    dsp = parser.add_argument_group("upscaling")
+    dsp.add_argument("--max-iterations", type=int)
+    dsp.add_argument("--threshold", type=float, dest="threshold_value")
+    dsp.add_argument("--target-bitrate", type=int, dest="target_bitrate_kbps")
+    dsp.add_argument(
+        "--no-normalize", action="store_false", dest="toggle_normalize", default=None
+    )
+    dsp.add_argument(
+        "--no-autoscale", action="store_false", dest="toggle_autoscale", default=None
+    )
+    dsp.add_argument(
+        "--no-adaptive-filter",
+        action="store_false",
+        dest="toggle_adaptive_filter",
+        default=None,
+    )
+    dsp.add_argument("--backend", choices=[str(t) for t in BackendTypes])
+    dsp.add_argument("--fft-workers", type=int)
+    dsp.add_argument(
+        "--complex-fft", action="store_false", dest="use_real_fft", default=None
+    )
+    dsp.add_argument("--interpolation", choices=[str(t) for t in InterpolationTypes])
+    dsp.add_argument("--fft-padding", choices=[str(t) for t in FFTPaddingTypes])
+    dsp.add_argument("--precision", choices=[str(t) for t in PrecisionTypes])
+    dsp.add_argument("--tolerance", type=float, dest="convergence_tolerance")
+    dsp.add_argument("--max-support-change", type=int)
+    dsp.add_argument("--check-interval", type=int, dest="convergence_check_interval")
+    dsp.add_argument("--streaming", action="store_true", default=None)
+    dsp.add_argument("--window-frames", type=int, dest="stream_window_frames")
+    dsp.add_argument("--overlap-frames", type=int, dest="stream_overlap_frames")
+    dsp.add_argument("--pcm-cache-dir")
+    return parser
+
+
+_SETTING_FIELDS: Final[tuple[str, ...]] = (
+    "max_iterations",
+    "threshold_value",
+    "target_bitrate_kbps",
+    "toggle_normalize",
+    "toggle_autoscale",
+    "toggle_adaptive_filter",
+    "fft_workers",
+    "use_real_fft",
+    "convergence_tolerance",
+    "max_support_change",
+    "convergence_check_interval",
+    "streaming",
+    "stream_window_frames",
+    "stream_overlap_frames",
+    "pcm_cache_dir",
+    "opus_bitrate_kbps",
+    "opus_complexity",
+    "opus_frame_ms",
+)
+
+
+def upscale_settings_from(args: argparse.Namespace) -> dict[str, Any]:
+    """Configurações padrão do pipeline com as opções passadas na linha de comando."""
+    settings = dict(DEFAULT_UPSCALE_SETTINGS)
+    settings.update(
+        {
+            name: getattr(args, name)
+            for name in _SETTING_FIELDS
+            if getattr(args, name) is not None
+        }
+    )
+    if args.format is not None:
+        settings["target_format"] = next(
+            t for t in _OUTPUT_FORMATS if str(t) == args.format
+        )
+    if args.backend is not None:
+        settings["backend"] = next(t for t in BackendTypes if str(t) == args.backend)
+    if args.interpolation is not None:
+        settings["interpolation"] = next(
+            t for t in InterpolationTypes if str(t) == args.interpolation
+        )
+    if args.fft_padding is not None:
+        settings["fft_padding"] = next(
+            t for t in FFTPaddingTypes if str(t) == args.fft_padding
+        )
+    if args.precision is not None:
+        settings["precision"] = next(
+            t for t in PrecisionTypes if str(t) == args.precision
+        )
+    return settings
+
+
+class StageProgress:
+    """Uma barra `tqdm` por estágio, atualizada pelas threads do executor."""
+
+    def __init__(self, stages: Sequence[str]) -> None:
+        self._lock = threading.Lock()
+        self._bars = {
+            name: tqdm(desc=f"{name:<9}", unit="faixa", position=i, leave=True)
+            for i, name in enumerate(stages)
+        }
+        self.failed = 0
+
+    def __call__(self, stage: str, ok: bool) -> None:
+        with self._lock:
+            self._bars[stage].update(1)
+            if not ok:
+                self.failed += 1
+                self._bars[stage].set_postfix(falhas=self.failed)
+
+    def close(self) -> None:
+        for bar in self._bars.values():
+            bar.close()
+
+
+def _format_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TiB"
+
+
+def summarize(report: StagedRunReport) -> str:
+    jobs: list[LinkJob] = [job for job in report.completed if not job.retag_only]
+    audio_seconds = sum(job.audio_seconds for job in jobs)
+    bytes_in = sum(job.bytes_in for job in jobs)
+    bytes_out = sum(
+        os.path.getsize(job.output_path)
+        for job in jobs
+        if job.output_path and os.path.exists(job.output_path)
+    )
+    wall = report.wall_seconds or 1e-9
+    lines = [
+        f"Concluídas: {len(report.completed)}  Falhas: {len(report.failures)}  "
+        f"Tempo total: {report.wall_seconds:.1f} s",
+        "Tempo ocupado por estágio (somado entre workers):",
+    ]
+    for name, seconds in report.stage_seconds.items():
+        lines.append(
+            f"  {name:<9} {seconds:8.1f} s  ({seconds / wall:5.2f}x do tempo total)"
+        )
+    lines += [
+        f"Áudio processado: {audio_seconds:.1f} s  "
+        f"(fator de tempo real {audio_seconds / wall:.2f}x)",
+        f"Bytes: entrada {_format_bytes(bytes_in)}, saída {_format_bytes(bytes_out)}",
+    ]
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    sources = list(args.urls)
+    for source in args.input:
+        sources.extend(read_links(source))
+    if not sources:
+        build_parser().error("nenhum link informado (use URLs, -i arquivo ou -i -)")
+
+    configure_tracing(args.trace, args.profile, args.profile_dir)
+    expand_failures: list[StageFailure] = []
+
+    def expand_failed(link: str, exc: Exception) -> None:
+        print(f"  ❌ {link} falhou em 'expand': {exc}")
+        expand_failures.append(
+            StageFailure("expand", LinkJob(link, args.output_dir), exc)
+        )
+
+    progress = StageProgress(_STAGES)
+    try:
+        report = process_youtube_links(
+            expand_links(sources, on_error=expand_failed),
+            output_dir=args.output_dir,
+            executor_config=ExecutorConfig(
+                download_workers=args.download_workers,
+                thumbnail_workers=args.thumbnail_workers,
+                decode_workers=args.decode_workers,
+                dsp_workers=args.dsp_workers,
+                writer_workers=args.writer_workers,
+                queue_size=args.queue_size,
+            ),
+            cache_config=(
+                DownloadCacheConfig(args.cache_dir, int(args.cache_max_gb * 1024**3))
+                if args.cache_dir
+                else None
+            ),
+            download_mode=DownloadMode.NATIVE if args.native else DownloadMode.MP3,
+            upscale_settings=upscale_settings_from(args),
+            on_progress=progress,
+        )
+    finally:
+        progress.close()
+    report.failures.extend(expand_failures)
+    print(summarize(report))
+    return 1 if report.failures else 0
@@ -0,0 +1,206 @@
+# src/cover_art.py
+import hashlib
+import io
+import json
+import mimetypes
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import cache
+from pathlib import Path
+from typing import Any, Final, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from src.types import CoverArt, CoverArtConfig
+
+try:
+    from PIL import Image
+except ImportError:  # sem Pillow as capas são embutidas como baixadas
+    Image = None
+
+_RETRY_STATUS: Final[tuple[int, ...]] = (429, 500, 502, 503, 504)
+
+
+def youtube_thumbnail_url(video_id: str) -> str:
+    """URL previsível da thumbnail em resolução máxima, conhecida antes do download."""
+    return f"https://i.ytimg.com/vi/{video_id}/maxresdefault.jpg"
+
+
+def build_session(pool_size: int, retries: int) -> requests.Session:
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.5,
+        status_forcelist=_RETRY_STATUS,
+        allowed_methods=frozenset({"GET"}),
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def prepare_cover(
+    data: bytes, mime: str, max_dimension: Optional[int], quality: int
+) -> CoverArt:
+    """
+    Converte capas WebP ou maiores que `max_dimension` para um JPEG limitado.
+    Sem Pillow, ou se a imagem não puder ser lida, devolve os bytes originais.
+    """
+    if Image is None or max_dimension is None:
+        return CoverArt(data=data, mime=mime)
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            if image.format == "JPEG" and max(image.size) <= max_dimension:
+                return CoverArt(data=data, mime="image/jpeg")
+            image.thumbnail((max_dimension, max_dimension))
+            out = io.BytesIO()
+            image.convert("RGB").save(
+                out, format="JPEG", quality=quality, optimize=True
+            )
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return CoverArt(data=data, mime=mime)
+    return CoverArt(data=out.getvalue(), mime="image/jpeg")
+
+
+class CoverArtService:
+    """
+    Busca capas com uma `requests.Session` compartilhada (pool de conexões e
+    retentativas) e um cache em disco chaveado pela URL. Entradas em cache
+    são revalidadas com ETag/Last-Modified; se a rede falhar, a cópia local
+    é usada. `prefetch` inicia a busca em segundo plano para que a capa já
+    esteja pronta quando o áudio terminar; a busca pendente é identificada
+    por `key` (o ID do vídeo), já que `get` pode receber outra URL.
+    """
+
+    def __init__(
+        self,
+        config: Optional[CoverArtConfig] = None,
+        session: Optional[requests.Session] = None,
+    ) -> None:
+        self.config = config or CoverArtConfig()
+        self.session = session or build_session(
+            self.config.pool_size, self.config.retries
+        )
+        self.cache_dir = Path(self.config.cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.config.pool_size, thread_name_prefix="cover"
+        )
+        self._pending: dict[str, Future[CoverArt]] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, url: str, key: Optional[str]) -> str:
+        return key or self._cache_key(url)
+
+    def _cache_key(self, url: str) -> str:
+        return hashlib.sha256(url.encode()).hexdigest()[:16]
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        return self.cache_dir / f"{key}.img", self.cache_dir / f"{key}.json"
+
+    def _load(self, key: str) -> Optional[tuple[CoverArt, dict[str, Any]]]:
+        data_path, meta_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            data = data_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+        return CoverArt(data=data, mime=meta["mime"]), meta
+
+    def _store(self, key: str, cover: CoverArt, meta: dict[str, Any]) -> None:
+        data_path, meta_path = self._paths(key)
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp_data = data_path.with_suffix(suffix)
+        tmp_data.write_bytes(cover.data)
+        os.replace(tmp_data, data_path)
+        tmp_meta = meta_path.with_suffix(suffix)
+        tmp_meta.write_text(json.dumps({**meta, "mime": cover.mime}), encoding="utf-8")
+        os.replace(tmp_meta, meta_path)
+
+    def fetch(self, url: str) -> CoverArt:
+        key = self._cache_key(url)
+        cached = self._load(key)
+        headers = {}
+        if cached is not None:
+            if etag := cached[1].get("etag"):
+                headers["If-None-Match"] = etag
+            if last_modified := cached[1].get("last_modified"):
+                headers["If-Modified-Since"] = last_modified
+        try:
+            response = self.session.get(
+                url, headers=headers, timeout=self.config.timeout
+            )
+            if response.status_code == 304 and cached is not None:
+                return cached[0]
+            response.raise_for_status()
+        except requests.RequestException:
+            if cached is None:
+                raise
+            return cached[0]
+        mime = (
+            response.headers.get("Content-Type", "").split(";")[0]
+            or mimetypes.guess_type(url)[0]
+            or "image/jpeg"
+        )
+        cover = prepare_cover(
+            response.content, mime, self.config.max_dimension, self.config.jpeg_quality
+        )
+        self._store(
+            key,
+            cover,
+            {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            },
+        )
+        return cover
+
+    def prefetch(self, url: str, key: Optional[str] = None) -> Future[CoverArt]:
+        key = self._key(url, key)
+        with self._lock:
+            if key not in self._pending:
+                self._pending[key] = self._executor.submit(self.fetch, url)
+            return self._pending[key]
+
+    def get(self, url: str, key: Optional[str] = None) -> CoverArt:
+        """
+        Capa para `key`: usa a busca antecipada se ela tiver dado certo (mesmo
+        que de outra URL), senão busca `url` diretamente.
+        """
+        with self._lock:
+            pending = self._pending.pop(self._key(url, key), None)
+        if pending is not None:
+            try:
+                return pending.result()
+            except requests.RequestException:
+                pass
+        return self.fetch(url)
+
+    def discard(self, url: str, key: Optional[str] = None) -> None:
+        """Abandona a busca antecipada de `key` (o link falhou antes da capa)."""
+        with self._lock:
+            pending = self._pending.pop(self._key(url, key), None)
+        if pending is not None:
+            pending.cancel()
+
+    def close(self) -> None:
+        with self._lock:
+            self._pending.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+    def __enter__(self) -> "CoverArtService":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+@cache
+def default_cover_service() -> CoverArtService:
+    return CoverArtService()
@@ -1,17 +1,23 @@
 # src/downloader.py
-from typing import Final
+from typing import Any, Final, Optional
 from pathlib import Path
+import shutil
 import yt_dlp
-from src.types import DownloadResult
+from src.cache import DownloadCache
+from src.types import DownloadMode, DownloadResult
+from src.utils import _extract_video_id
 
 from pathvalidate import sanitize_filename
 
 
-def download_audio(url: str, output_dir: str) -> DownloadResult:
+def build_download_options(
+    output_dir: str, mode: DownloadMode = DownloadMode.MP3
+) -> dict[str, Any]:
     """
-    Baixa áudio do YouTube em WAV e retorna metadados e caminho da thumbnail.
+    Opções do yt-dlp. Em `DownloadMode.NATIVE` o stream original (Opus/AAC)
+    é mantido, sem o pós-processador que transcodifica para MP3.
     """
-    ydl_opts = {
+    options: dict[str, Any] = {
         "format": "bestaudio/best",
         "outtmpl": f"""{output_dir}/%(title)s.%(ext)s""",
         "postprocessors": [
@@ -27,13 +33,82 @@ def download_audio(url: str, output_dir: str) -> DownloadResult:
         "noplaylist": True,
         "restrictfilenames": True,
     }
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:  # type: ignore
-        info = ydl.extract_info(url, download=True)
-        title = sanitize_filename(info.get("title", "audio").replace('"', ""), platform="windows")  # type: ignore
-        thumbnail_url = info.get("thumbnail", "")  # type: ignore
-        audio_path = Path(ydl.prepare_filename(info).replace("webm", "mp3"))  # type: ignore
+    if mode is DownloadMode.NATIVE:
+        options["format"] = "bestaudio[acodec=opus]/bestaudio[ext=m4a]/bestaudio"
+        options["postprocessors"] = []
+    return options
+
+
+def _result_from_info(
+    info: dict[str, Any], audio_path: Path, temporary: bool
+) -> DownloadResult:
+    title = sanitize_filename(info.get("title", "audio").replace('"', ""), platform="windows")  # type: ignore
+    thumbnail_url = info.get("thumbnail", "") or ""
     return DownloadResult(
         audio_path=str(audio_path),
         title=title,  # type: ignore
-        thumbnail_url=thumbnail_url.replace("\\", "/"),  # type: ignore
+        thumbnail_url=thumbnail_url.replace("\\", "/"),
+        video_id=info.get("id"),
+        temporary=temporary,
+        abr=info.get("abr"),
+        source_hash=info.get("_source_hash"),
     )
+
+
+def _download(
+    url: str, ydl_opts: dict[str, Any], mode: DownloadMode
+) -> tuple[dict[str, Any], Path]:
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:  # type: ignore
+        info = ydl.extract_info(url, download=True)
+        if mode is DownloadMode.NATIVE:
+            downloads = info.get("requested_downloads") or [{}]  # type: ignore
+            audio_path = Path(downloads[0].get("filepath") or ydl.prepare_filename(info))  # type: ignore
+        else:
+            audio_path = Path(ydl.prepare_filename(info).replace("webm", "mp3"))  # type: ignore
+        return ydl.sanitize_info(info), audio_path  # type: ignore
+
+
+def cached_source_hash(
+    video_id: str, cache: DownloadCache, mode: DownloadMode = DownloadMode.MP3
+) -> Optional[str]:
+    """sha256 do áudio já presente no cache para o vídeo, sem baixar nada."""
+    hit = cache.get(video_id, build_download_options("", mode))
+    return None if hit is None else hit.info.get("_source_hash")
+
+
+def download_audio(
+    url: str,
+    output_dir: str,
+    cache: Optional[DownloadCache] = None,
+    mode: DownloadMode = DownloadMode.MP3,
+) -> DownloadResult:
+    """
+    Baixa áudio do YouTube e retorna metadados e caminho da thumbnail.
+    Em `DownloadMode.MP3` o áudio é transcodificado para MP3; em
+    `DownloadMode.NATIVE` o stream original é mantido e o resultado traz o
+    abr informado pelo YouTube.
+    Com `cache`, consulta primeiro a entrada do ID do vídeo (mesmo formato e
+    pós-processadores) e só chama o yt-dlp em caso de falta.
+    """
+    video_id: Final[Optional[str]] = _extract_video_id(url)
+    if cache is None or video_id is None:
+        info, audio_path = _download(
+            url, build_download_options(output_dir, mode), mode
+        )
+        return _result_from_info(info, audio_path, temporary=True)
+
+    options = build_download_options(output_dir, mode)
+    hit = cache.get(video_id, options)
+    if hit is not None:
+        return _result_from_info(hit.info, hit.audio_path, temporary=False)
+
+    staging = cache.staging_dir()
+    try:
+        info, audio_path = _download(
+            url, build_download_options(str(staging), mode), mode
+        )
+        entry = cache.put(video_id, options, staging, audio_path, info)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return _result_from_info(entry.info, entry.audio_path, temporary=False)
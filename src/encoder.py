@@ -5,10 +5,9 @@ from mutagen.mp3 import MP3
 from mutagen.id3 import ID3
 from mutagen.id3._frames import APIC, TIT2
 from mutagen.id3._util import error
-import requests
 from mutagen.flac import FLAC, Picture
-import requests
 import mimetypes
+from src.cover_art import default_cover_service
 
 
 def wav_to_mp3_with_thumbnail(
@@ -21,10 +20,8 @@ def wav_to_mp3_with_thumbnail(
     audio = AudioSegment.from_wav(wav_path)
     audio.export(mp3_path, format="mp3", bitrate="320k")
 
-    # Download da thumbnail
-    response = requests.get(thumbnail_url, timeout=10)
-    response.raise_for_status()
-    image_data = response.content
+    # Download da thumbnail (sessão compartilhada + cache em disco)
+    cover = default_cover_service().get(thumbnail_url)
 
     # Adiciona tags ID3 (capa e título)
     audio_mp3 = MP3(mp3_path, ID3=ID3)
@@ -36,10 +33,10 @@ def wav_to_mp3_with_thumbnail(
     audio_mp3.add_tags(
         APIC(
             encoding=3,  # UTF-8
-            mime="image/jpeg",  # ou "image/png" conforme thumbnail
+            mime=cover.mime,
             type=3,  # Cover (front)
             desc="Cover",
-            data=image_data,
+            data=cover.data,
         )
     )
     audio_mp3.add_tags(TIT2(encoding=3, text=title))
@@ -0,0 +1,113 @@
+# src/executor.py
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Optional
+
+logger = logging.getLogger("youtube2opus.executor")
+
+_SENTINEL: object = object()
+
+
+@dataclass(frozen=True, slots=True)
+class Stage:
+    """
+    Estágio do pipeline: `fn` transforma um item e roda em `workers` threads.
+    Estágios de CPU usam `fn` que delega a um pool de processos e apenas
+    aguardam o resultado na thread.
+    """
+
+    name: str
+    fn: Callable[[Any], Any]
+    workers: int = 1
+
+
+@dataclass(frozen=True, slots=True)
+class StageFailure:
+    stage: str
+    item: Any
+    error: BaseException
+
+
+@dataclass(slots=True)
+class StagedRunReport:
+    completed: list[Any] = field(default_factory=list)
+    failures: list[StageFailure] = field(default_factory=list)
+    stage_seconds: dict[str, float] = field(default_factory=dict)
+    wall_seconds: float = 0.0
+
+
+def run_stages(
+    items: Iterable[Any],
+    stages: list[Stage],
+    queue_size: int = 4,
+    on_progress: Optional[Callable[[str, bool], None]] = None,
+) -> StagedRunReport:
+    """
+    Executa `items` através de `stages` com filas limitadas entre estágios.
+    O item N+1 avança em um estágio enquanto o item N está no seguinte, então
+    a vazão tende à do estágio mais lento. Uma falha em um item é registrada
+    e o item é descartado, sem bloquear os demais.
+    O tempo ocupado de cada estágio (somado entre as threads) fica em
+    `stage_seconds`; `on_progress(estágio, ok)` é chamado a cada item.
+    """
+    report = StagedRunReport(stage_seconds={stage.name: 0.0 for stage in stages})
+    started = time.perf_counter()
+    lock = threading.Lock()
+    queues: list[queue.Queue] = [queue.Queue(maxsize=queue_size) for _ in stages]
+    queues.append(queue.Queue())
+
+    def worker(index: int) -> None:
+        stage = stages[index]
+        inbox, outbox = queues[index], queues[index + 1]
+        while True:
+            item = inbox.get()
+            if item is _SENTINEL:
+                break
+            begin = time.perf_counter()
+            try:
+                result = stage.fn(item)
+            except BaseException as exc:
+                logger.error(f"Falha no estágio '{stage.name}': {exc!r}")
+                with lock:
+                    report.failures.append(StageFailure(stage.name, item, exc))
+                    report.stage_seconds[stage.name] += time.perf_counter() - begin
+                if on_progress is not None:
+                    on_progress(stage.name, False)
+                continue
+            with lock:
+                report.stage_seconds[stage.name] += time.perf_counter() - begin
+            if on_progress is not None:
+                on_progress(stage.name, True)
+            outbox.put(result)
+
+    threads: list[list[threading.Thread]] = []
+    for index, stage in enumerate(stages):
+        stage_threads = [
+            threading.Thread(
+                target=worker, args=(index,), name=f"{stage.name}-{n}", daemon=True
+            )
+            for n in range(max(1, stage.workers))
+        ]
+        for t in stage_threads:
+            t.start()
+        threads.append(stage_threads)
+
+    def close_stages() -> None:
+        for index, stage_threads in enumerate(threads):
+            for _ in stage_threads:
+                queues[index].put(_SENTINEL)
+            for t in stage_threads:
+                t.join()
+
+    try:
+        for item in items:
+            queues[0].put(item)
+    finally:
+        close_stages()
+    while not queues[-1].empty():
+        report.completed.append(queues[-1].get())
+    report.wall_seconds = time.perf_counter() - started
+    return report
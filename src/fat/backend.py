@@ -0,0 +1,207 @@
+from abc import ABC, abstractmethod
+from functools import cache
+from types import ModuleType
+from typing import Any, Optional
+import numpy as np
+import scipy.fft as sp_fft
+from .types import BackendTypes, NpArray
+
+try:
+    import cupy as cp
+    import cupyx
+except ImportError:  # nós de render só-CPU
+    cp = None
+    cupyx = None
+
+
+class ArrayBackend(ABC):
+    """
+    Interface comum para os backends de arrays (NumPy/SciPy ou CuPy).
+    Cada backend expõe o módulo de arrays em `xp` e as operações que
+    dependem do dispositivo (FFT, sincronização e memória).
+    """
+
+    kind: BackendTypes
+    xp: ModuleType
+    # FFTs diretas e inversas executadas (lido pelos spans de `tracing`).
+    fft_calls: int = 0
+    # Arrays já estão na memória do host (`asnumpy` não copia).
+    host_resident: bool = True
+
+    @abstractmethod
+    def fft(self, a: Any, axis: int = 0) -> Any: ...
+
+    @abstractmethod
+    def ifft(self, a: Any, axis: int = 0) -> Any: ...
+
+    @abstractmethod
+    def rfft(self, a: Any, axis: int = 0, n: Optional[int] = None) -> Any: ...
+
+    @abstractmethod
+    def irfft(self, a: Any, n: int, axis: int = 0) -> Any: ...
+
+    def asarray(self, a: Any, dtype: Any = None) -> Any:
+        return self.xp.asarray(a, dtype=dtype)
+
+    def sliding_window_view(
+        self, a: Any, window: int, axis: Optional[int] = None
+    ) -> Any:
+        return self.xp.lib.stride_tricks.sliding_window_view(a, window, axis=axis)
+
+    def asnumpy(self, a: Any) -> NpArray:
+        return np.asarray(a)
+
+    def host_buffer(self, shape: tuple[int, ...], dtype: Any) -> NpArray:
+        """Buffer do host para cópias do dispositivo (fixado na memória no CuPy)."""
+        return np.empty(shape, dtype=dtype)
+
+    def copy_to_host_async(self, a: Any, out: NpArray) -> Optional[Any]:
+        """
+        Copia `a` (contíguo) para `out` e devolve um evento a passar para
+        `wait_event` antes de ler `out` (`None` se a cópia já terminou). `a`
+        deve continuar vivo até lá.
+        """
+        np.copyto(out, a)
+        return None
+
+    def wait_event(self, event: Optional[Any]) -> None:
+        pass
+
+    def synchronize(self) -> None:
+        pass
+
+    def free_memory(self) -> None:
+        pass
+
+    def set_plan_cache_size(self, size: int) -> None:
+        pass
+
+    def clear_plan_cache(self) -> None:
+        pass
+
+    def used_bytes(self) -> int:
+        return 0
+
+    def reserved_bytes(self) -> int:
+        return 0
+
+
+class NumpyBackend(ArrayBackend):
+    kind = BackendTypes.NUMPY
+    xp = np
+
+    def __init__(self, workers: int = -1) -> None:
+        self.workers = workers
+
+    def fft(self, a: NpArray, axis: int = 0) -> NpArray:
+        self.fft_calls += 1
+        return sp_fft.fft(a, axis=axis, workers=self.workers)
+
+    def ifft(self, a: NpArray, axis: int = 0) -> NpArray:
+        self.fft_calls += 1
+        return sp_fft.ifft(a, axis=axis, workers=self.workers)
+
+    def rfft(self, a: NpArray, axis: int = 0, n: Optional[int] = None) -> NpArray:
+        self.fft_calls += 1
+        return sp_fft.rfft(a, n=n, axis=axis, workers=self.workers)
+
+    def irfft(self, a: NpArray, n: int, axis: int = 0) -> NpArray:
+        self.fft_calls += 1
+        return sp_fft.irfft(a, n=n, axis=axis, workers=self.workers)
+
+
+class CupyBackend(ArrayBackend):
+    kind = BackendTypes.CUPY
+    host_resident = False
+
+    def __init__(self) -> None:
+        if not cupy_available():
+            raise RuntimeError("Backend CuPy solicitado, mas CuPy/GPU indisponível.")
+        self.xp = cp
+        # Stream só para cópias dispositivo -> host, sobrepostas ao cálculo.
+        self._copy_stream = cp.cuda.Stream(non_blocking=True)
+
+    def fft(self, a: Any, axis: int = 0) -> Any:
+        self.fft_calls += 1
+        return cp.fft.fft(a, axis=axis)
+
+    def ifft(self, a: Any, axis: int = 0) -> Any:
+        self.fft_calls += 1
+        return cp.fft.ifft(a, axis=axis)
+
+    def rfft(self, a: Any, axis: int = 0, n: Optional[int] = None) -> Any:
+        self.fft_calls += 1
+        return cp.fft.rfft(a, n=n, axis=axis)
+
+    def irfft(self, a: Any, n: int, axis: int = 0) -> Any:
+        self.fft_calls += 1
+        return cp.fft.irfft(a, n=n, axis=axis)
+
+    def asnumpy(self, a: Any) -> NpArray:
+        return cp.asnumpy(a)
+
+    def host_buffer(self, shape: tuple[int, ...], dtype: Any) -> NpArray:
+        return cupyx.empty_pinned(shape, dtype=dtype)
+
+    def copy_to_host_async(self, a: Any, out: NpArray) -> Optional[Any]:
+        # A cópia espera o cálculo já enfileirado no stream atual. Com
+        # `blocking=False` ela só é enfileirada (`out` é fixado, de
+        # `host_buffer`); `out` só pode ser lido depois do evento.
+        self._copy_stream.wait_event(cp.cuda.get_current_stream().record())
+        a.get(stream=self._copy_stream, out=out, blocking=False)
+        return self._copy_stream.record()
+
+    def wait_event(self, event: Optional[Any]) -> None:
+        if event is not None:
+            event.synchronize()
+
+    def synchronize(self) -> None:
+        cp.cuda.Stream.null.synchronize()
+
+    def free_memory(self) -> None:
+        cp.get_default_memory_pool().free_all_blocks()
+
+    def set_plan_cache_size(self, size: int) -> None:
+        cp.fft.config.set_plan_cache_size(size)
+
+    def clear_plan_cache(self) -> None:
+        cp.fft.config.get_plan_cache().clear()
+
+    def used_bytes(self) -> int:
+        return cp.get_default_memory_pool().used_bytes()
+
+    def reserved_bytes(self) -> int:
+        return cp.get_default_memory_pool().total_bytes()
+
+
+@cache
+def cupy_available() -> bool:
+    if cp is None:
+        return False
+    try:
+        return cp.cuda.runtime.getDeviceCount() > 0
+    except Exception:
+        return False
+
+
+@cache
+def get_backend(
+    kind: BackendTypes = BackendTypes.AUTO, fft_workers: int = -1
+) -> ArrayBackend:
+    match kind:
+        case BackendTypes.AUTO:
+            if cupy_available():
+                return CupyBackend()
+            return NumpyBackend(workers=fft_workers)
+        case BackendTypes.CUPY:
+            return CupyBackend()
+        case BackendTypes.NUMPY:
+            return NumpyBackend(workers=fft_workers)
+        case _:
+            raise ValueError(f"Backend não suportado: {kind}")
+
+
+def backend_for(arr: Any) -> ArrayBackend:
+    if cp is not None and isinstance(arr, cp.ndarray):
+        return get_backend(BackendTypes.CUPY)
+    return get_backend(BackendTypes.NUMPY)
@@ -1,5 +1,18 @@
 from dataclasses import dataclass
-from .types import AudioTypes
+from typing import Any, Optional
+from .types import (
+    AudioTypes,
+    BackendTypes,
+    ConvergenceCriteria,
+    FFTPaddingTypes,
+    InterpolationTypes,
+    OpusSettings,
+    OutputMetadata,
+    PrecisionTypes,
+)
+
+# Tamanho máximo de um bloco de metadados FLAC (campo de 24 bits).
+_FLAC_MAX_BLOCK_BYTES = 2**24 - 1
 
 
 @dataclass(frozen=True)
@@ -9,17 +22,40 @@ class UpscaleConfig:
     source_format: AudioTypes
     target_format: AudioTypes
     max_iterations: int = 300
+    interpolation: InterpolationTypes = InterpolationTypes.POLYPHASE
     threshold_value: float = 0.6
     target_bitrate_kbps: int = 1411
+    source_bitrate_kbps: Optional[float] = None
     toggle_normalize: bool = True
     toggle_autoscale: bool = True
     toggle_adaptive_filter: bool = True
+    use_real_fft: bool = True
+    fft_padding: FFTPaddingTypes = FFTPaddingTypes.NONE
+    precision: PrecisionTypes = PrecisionTypes.FLOAT32
+    convergence_tolerance: Optional[float] = None
+    max_support_change: Optional[int] = None
+    convergence_check_interval: int = 50
+    streaming: bool = False
+    stream_window_frames: int = 65_536
+    stream_overlap_frames: int = 4_096
+    write_block_frames: int = 262_144
+    opus_bitrate_kbps: int = 160
+    opus_complexity: int = 10
+    opus_frame_ms: float = 20.0
+    metadata: Optional[OutputMetadata] = None
+    pcm_cache_dir: Optional[str] = None
+    backend: BackendTypes = BackendTypes.AUTO
+    fft_workers: int = -1
+    workspace_budget_mb: Optional[int] = 1024
 
 
 def validate_config(cfg: UpscaleConfig) -> None:
+    # Bitrate-alvo do upscaling (define o fator); no Opus a taxa de bits do
+    # arquivo é `opus_bitrate_kbps`.
     valid_bitrate_ranges = {
         AudioTypes.FLAC: (800, 1411),
         AudioTypes.WAV: (800, 6444),
+        AudioTypes.OPUS: (800, 1411),
     }
     if cfg.target_format not in valid_bitrate_ranges:
         raise ValueError(f"Formato de saída não suportado: {cfg.target_format}")
@@ -28,3 +64,111 @@ def validate_config(cfg: UpscaleConfig) -> None:
         raise ValueError(
             f"Bitrate {cfg.target_bitrate_kbps} fora do intervalo para {cfg.target_format}."
         )
+    if cfg.target_format == AudioTypes.OPUS:
+        validate_opus(opus_settings(cfg))
+    if cfg.max_iterations < 0:
+        raise ValueError(f"max_iterations inválido: {cfg.max_iterations}")
+    if cfg.convergence_check_interval < 1:
+        raise ValueError(
+            f"convergence_check_interval deve ser >= 1: {cfg.convergence_check_interval}"
+        )
+    if cfg.convergence_tolerance is not None and cfg.convergence_tolerance <= 0:
+        raise ValueError(
+            f"convergence_tolerance deve ser positivo: {cfg.convergence_tolerance}"
+        )
+    if cfg.max_support_change is not None and cfg.max_support_change < 0:
+        raise ValueError(
+            f"max_support_change não pode ser negativo: {cfg.max_support_change}"
+        )
+    if cfg.workspace_budget_mb is not None and cfg.workspace_budget_mb <= 0:
+        raise ValueError(
+            f"workspace_budget_mb deve ser positivo: {cfg.workspace_budget_mb}"
+        )
+    if cfg.write_block_frames < 1:
+        raise ValueError(f"write_block_frames deve ser >= 1: {cfg.write_block_frames}")
+    if cfg.metadata is not None and not (
+        0 <= cfg.metadata.reserved_bytes < _FLAC_MAX_BLOCK_BYTES
+    ):
+        raise ValueError(
+            f"reserved_bytes deve estar entre 0 e {_FLAC_MAX_BLOCK_BYTES}: "
+            f"{cfg.metadata.reserved_bytes}"
+        )
+    if not (0 <= cfg.stream_overlap_frames < cfg.stream_window_frames):
+        raise ValueError(
+            f"stream_overlap_frames ({cfg.stream_overlap_frames}) deve estar entre 0 e "
+            f"stream_window_frames ({cfg.stream_window_frames})."
+        )
+    if cfg.streaming and cfg.pcm_cache_dir is not None:
+        raise ValueError(
+            "pcm_cache_dir não é usado no modo streaming (o PCM é decodificado "
+            "por janela); remova uma das duas opções."
+        )
+
+
+# Durações de quadro aceitas pelo libopus, em ms.
+_OPUS_FRAME_MS = (2.5, 5.0, 10.0, 20.0, 40.0, 60.0, 80.0, 100.0, 120.0)
+
+
+def validate_opus(settings: OpusSettings) -> None:
+    if not (6 <= settings.bitrate_kbps <= 510):
+        raise ValueError(
+            f"Bitrate Opus fora do intervalo 6-510 kbps: {settings.bitrate_kbps}"
+        )
+    if not (0 <= settings.complexity <= 10):
+        raise ValueError(
+            f"Complexidade Opus deve estar entre 0 e 10: {settings.complexity}"
+        )
+    if settings.frame_ms not in _OPUS_FRAME_MS:
+        raise ValueError(
+            f"Duração de quadro Opus inválida: {settings.frame_ms} ms "
+            f"(aceitas: {', '.join(f'{ms:g}' for ms in _OPUS_FRAME_MS)})"
+        )
+
+
+def opus_settings(cfg: UpscaleConfig) -> OpusSettings:
+    return OpusSettings(
+        bitrate_kbps=cfg.opus_bitrate_kbps,
+        complexity=cfg.opus_complexity,
+        frame_ms=cfg.opus_frame_ms,
+    )
+
+
+def convergence_criteria(cfg: UpscaleConfig) -> ConvergenceCriteria:
+    return ConvergenceCriteria(
+        tolerance=cfg.convergence_tolerance,
+        max_support_change=cfg.max_support_change,
+        check_interval=cfg.convergence_check_interval,
+    )
+
+
+def working_dtype(cfg: UpscaleConfig, xp: Any) -> Any:
+    """
+    dtype real de toda a cadeia (interpolação, IST, normalização, LMS e
+    saída); os espectros usam o complexo correspondente.
+    """
+    match cfg.precision:
+        case PrecisionTypes.FLOAT32:
+            return xp.float32
+        case PrecisionTypes.FLOAT64:
+            return xp.float64
+        case _:
+            raise ValueError(f"Precisão não suportada: {cfg.precision}")
+
+
+def workspace_budget_bytes(cfg: UpscaleConfig) -> Optional[int]:
+    """Orçamento do `FFTWorkspace` em bytes (`None`: sem limite)."""
+    if cfg.workspace_budget_mb is None:
+        return None
+    return cfg.workspace_budget_mb * 2**20
+
+
+def upscale_factor_for(cfg: UpscaleConfig, source_bitrate: Optional[int]) -> int:
+    """
+    Fator de upscaling a partir do bitrate da fonte. `source_bitrate_kbps`
+    (por exemplo, o abr informado pelo YouTube) tem precedência sobre o
+    bitrate lido do arquivo.
+    """
+    if cfg.source_bitrate_kbps:
+        source_bitrate = round(cfg.source_bitrate_kbps * 1000)
+    target_bitrate = cfg.target_bitrate_kbps * 1000
+    return round(target_bitrate / source_bitrate) if source_bitrate else 4
@@ -0,0 +1,133 @@
+import json
+import subprocess
+from typing import Iterator
+import numpy as np
+import soundfile as sf
+from .types import NpArray
+
+_FFMPEG_PCM_ARGS = ["-vn", "-sn", "-dn", "-f", "f32le", "-acodec", "pcm_f32le"]
+
+# Formatos lidos pelo libsndfile; os demais passam pelo pipe f32le do ffmpeg.
+SOUNDFILE_FORMATS = frozenset({"wav", "flac", "ogg"})
+
+
+def probe_audio(file_path: str) -> tuple[int, int, float]:
+    """Taxa de amostragem, canais e duração (s) do primeiro stream de áudio via ffprobe."""
+    out = subprocess.run(
+        [
+            "ffprobe",
+            "-v",
+            "error",
+            "-select_streams",
+            "a:0",
+            "-show_entries",
+            "stream=sample_rate,channels:format=duration",
+            "-of",
+            "json",
+            file_path,
+        ],
+        check=True,
+        capture_output=True,
+    )
+    probe = json.loads(out.stdout)
+    stream = probe["streams"][0]
+    duration = float(probe.get("format", {}).get("duration") or 0.0)
+    return int(stream["sample_rate"]), int(stream["channels"]), duration
+
+
+def _ffmpeg_command(file_path: str, sample_rate: int, channels: int) -> list[str]:
+    return [
+        "ffmpeg",
+        "-nostdin",
+        "-v",
+        "error",
+        "-drc_scale",
+        "0",
+        "-i",
+        file_path,
+        *_FFMPEG_PCM_ARGS,
+        "-ac",
+        str(channels),
+        "-ar",
+        str(sample_rate),
+        "pipe:1",
+    ]
+
+
+def decode_with_ffmpeg(
+    file_path: str, sample_rate: int, channels: int, duration: float = 0.0
+) -> NpArray:
+    """
+    Decodifica qualquer formato suportado pelo ffmpeg direto para PCM float32
+    intercalado (n, canais). O pipe é lido com `readinto` em um buffer
+    pré-alocado pela duração estimada, e o array é uma visão gravável dele.
+    """
+    frame_bytes = 4 * channels
+    capacity = max(int(duration * sample_rate * 1.01) + sample_rate, 1) * frame_bytes
+    buffer = bytearray(capacity)
+    filled = 0
+    with subprocess.Popen(
+        _ffmpeg_command(file_path, sample_rate, channels),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    ) as proc:
+        assert proc.stdout is not None
+        while True:
+            if filled == len(buffer):
+                buffer.extend(bytes(len(buffer) // 2))
+            with memoryview(buffer) as view:
+                read = proc.stdout.readinto(view[filled:])  # type: ignore
+            if not read:
+                break
+            filled += read
+        proc.stdout.close()
+        if proc.wait() != 0:
+            raise subprocess.CalledProcessError(proc.returncode, "ffmpeg")
+    frames = filled // frame_bytes
+    return np.frombuffer(buffer, dtype=np.float32, count=frames * channels).reshape(
+        (frames, channels)
+    )
+
+
+def decode_file(file_path: str, fmt: str) -> tuple[NpArray, int, int]:
+    """
+    Decodifica `file_path` para PCM float32 intercalado (n, canais) em [-1, 1].
+    Retorna (amostras, taxa de amostragem, canais), sem objetos intermediários.
+    """
+    if fmt in SOUNDFILE_FORMATS:
+        samples, sample_rate = sf.read(file_path, dtype="float32", always_2d=True)
+        return samples, sample_rate, samples.shape[1]
+    sample_rate, channels, duration = probe_audio(file_path)
+    samples = decode_with_ffmpeg(file_path, sample_rate, channels, duration)
+    return samples, sample_rate, channels
+
+
+def iter_ffmpeg_blocks(
+    file_path: str, sample_rate: int, channels: int, block_size: int, overlap: int = 0
+) -> Iterator[NpArray]:
+    """Equivalente a `SoundFile.blocks` para fontes decodificadas pelo ffmpeg."""
+    frame_bytes = 4 * channels
+    with subprocess.Popen(
+        _ffmpeg_command(file_path, sample_rate, channels),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    ) as proc:
+        assert proc.stdout is not None
+        previous = np.zeros((0, channels), dtype=np.float32)
+        while True:
+            toread = block_size - len(previous)
+            data = proc.stdout.read(toread * frame_bytes)
+            usable = len(data) - len(data) % frame_bytes
+            if usable == 0:
+                break
+            fresh = np.frombuffer(data[:usable], dtype=np.float32).reshape(
+                (-1, channels)
+            )
+            block = np.concatenate([previous, fresh])
+            previous = block[len(block) - overlap :].copy() if overlap else previous
+            yield block
+            if usable < toread * frame_bytes:
+                break
+        proc.stdout.close()
+        if proc.wait() != 0:
+            raise subprocess.CalledProcessError(proc.returncode, "ffmpeg")
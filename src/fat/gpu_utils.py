@@ -1,11 +1,13 @@
-import cupy as cp
 import gc
 import logging
 from contextlib import contextmanager
+from typing import Any
+from .backend import ArrayBackend
+from .workspace import get_workspace
 
 
 @contextmanager
-def gpu_memory_scope(*arrays: cp.ndarray):
+def gpu_memory_scope(backend: ArrayBackend, *arrays: Any):
     try:
         yield
     finally:
@@ -14,12 +16,16 @@ def gpu_memory_scope(*arrays: cp.ndarray):
                 del arr
             except Exception:
                 pass
-        cp.cuda.Stream.null.synchronize()
+        backend.synchronize()
         gc.collect()
-        cp.get_default_memory_pool().free_all_blocks()
-        logging.info("Memória GPU liberada pelo context manager.")
+        # Planos e buffers do workspace sobrevivem entre faixas; o pool só é
+        # devolvido se estiver acima do orçamento.
+        get_workspace(backend).trim()
+        logging.info(
+            f"Memória do backend {backend.kind} ajustada pelo context manager."
+        )
 
 
-def log_gpu_memory(stage: str) -> None:
-    used = cp.get_default_memory_pool().used_bytes() / 1e6
-    logging.info(f"[{stage}] Memória GPU usada: {used:.2f} MB")
+def log_gpu_memory(backend: ArrayBackend, stage: str) -> None:
+    used = backend.used_bytes() / 1e6
+    logging.info(f"[{stage}] Memória usada ({backend.kind}): {used:.2f} MB")
@@ -0,0 +1,138 @@
+from dataclasses import dataclass
+from typing import Any, Optional
+import numpy as np
+from .backend import ArrayBackend, backend_for
+from .types import InterpolationTypes, NpArray
+
+# Cruzamentos por zero de cada lado do núcleo e janela: o polifásico segue
+# `scipy.signal.resample_poly` (Kaiser, beta 5, 10 cruzamentos); o sinc
+# janelado usa Blackman com suporte maior, mais caro e com menos imagens.
+_POLYPHASE_ZERO_CROSSINGS = 10
+_POLYPHASE_KAISER_BETA = 5.0
+_SINC_ZERO_CROSSINGS = 32
+
+# Quadros de entrada por bloco do produto de matrizes: limita a cópia das
+# janelas deslizantes a alguns MB, independente da duração da faixa.
+_BLOCK_FRAMES = 16_384
+
+
+@dataclass(frozen=True, slots=True)
+class InterpolationCost:
+    """
+    Modelo de custo de um método: `taps` coeficientes por amostra de saída e
+    `operations` multiplicações-adições (cópias, no `REPEAT`) para o sinal.
+    O tempo esperado é `operations * ns_per_operation`, com o coeficiente
+    medido por `benchmarks.interpolation`.
+    """
+
+    method: InterpolationTypes
+    taps: int
+    operations: int
+
+    def seconds(self, ns_per_operation: float) -> float:
+        return self.operations * ns_per_operation * 1e-9
+
+
+def _zero_crossings(method: InterpolationTypes) -> int:
+    match method:
+        case InterpolationTypes.POLYPHASE:
+            return _POLYPHASE_ZERO_CROSSINGS
+        case InterpolationTypes.SINC:
+            return _SINC_ZERO_CROSSINGS
+        case _:
+            raise ValueError(f"Método sem núcleo FIR: {method}")
+
+
+def interpolation_kernel(method: InterpolationTypes, upscale_factor: int) -> NpArray:
+    """
+    Núcleo passa-baixas com corte no Nyquist original e ganho
+    `upscale_factor`, centrado em `zero_crossings * upscale_factor`. Como o
+    sinc se anula nos múltiplos do fator, as amostras originais são
+    preservadas (o núcleo é interpolador). Calculado no host: é pequeno.
+    """
+    half = _zero_crossings(method) * upscale_factor
+    t = (np.arange(2 * half + 1) - half) / upscale_factor
+    match method:
+        case InterpolationTypes.POLYPHASE:
+            window = np.kaiser(2 * half + 1, _POLYPHASE_KAISER_BETA)
+        case _:
+            window = np.blackman(2 * half + 1)
+    return np.sinc(t) * window
+
+
+def interpolation_cost(
+    method: InterpolationTypes, frames: int, channels: int, upscale_factor: int
+) -> InterpolationCost:
+    output_samples = frames * channels * upscale_factor
+    match method:
+        case InterpolationTypes.REPEAT:
+            taps = 1
+        case InterpolationTypes.POLYPHASE | InterpolationTypes.SINC:
+            taps = 2 * _zero_crossings(method) + 1
+        case _:
+            raise ValueError(f"Método de interpolação não suportado: {method}")
+    return InterpolationCost(method, taps, output_samples * taps)
+
+
+def _phase_matrix(kernel: NpArray, upscale_factor: int) -> tuple[NpArray, int, int]:
+    """
+    Reorganiza o núcleo em uma matriz (taps, fator): a coluna p tem os
+    coeficientes da fase p, alinhados às amostras x[n + d_min .. n + d_max].
+    """
+    half = (len(kernel) - 1) // 2
+    d_min = -(half // upscale_factor)
+    d_max = (upscale_factor - 1 + half) // upscale_factor
+    taps = d_max - d_min + 1
+    phases = np.zeros((taps, upscale_factor), dtype=kernel.dtype)
+    for p in range(upscale_factor):
+        for j in range(taps):
+            m = p - (d_min + j) * upscale_factor + half
+            if 0 <= m < len(kernel):
+                phases[j, p] = kernel[m]
+    return phases, d_min, d_max
+
+
+def polyphase_interpolate(
+    data: Any, upscale_factor: int, kernel: NpArray, backend: ArrayBackend
+) -> Any:
+    """
+    Interpolação por `upscale_factor` com o FIR `kernel` em forma polifásica:
+    sem inserir zeros, cada amostra de entrada gera as `upscale_factor` fases
+    de uma vez, com um produto de matrizes por bloco de janelas deslizantes.
+    """
+    xp = backend.xp
+    squeeze = data.ndim == 1
+    signal = data[:, xp.newaxis] if squeeze else data
+    frames, channels = signal.shape
+    phases, d_min, d_max = _phase_matrix(kernel, upscale_factor)
+    phases = backend.asarray(phases, dtype=signal.dtype)
+    padded = xp.pad(signal, [(-d_min, d_max), (0, 0)])
+    windows = backend.sliding_window_view(padded, len(phases), axis=0)
+    out = xp.empty((frames, upscale_factor, channels), dtype=signal.dtype)
+    for start in range(0, frames, _BLOCK_FRAMES):
+        end = min(start + _BLOCK_FRAMES, frames)
+        # (bloco, canais, taps) @ (taps, fator) -> (bloco, canais, fator)
+        block = xp.matmul(windows[start:end], phases)
+        out[start:end] = block.transpose(0, 2, 1)
+    out = out.reshape(frames * upscale_factor, channels)
+    return out[:, 0] if squeeze else out
+
+
+def interpolate(
+    data: Any,
+    upscale_factor: int,
+    method: InterpolationTypes = InterpolationTypes.REPEAT,
+    backend: Optional[ArrayBackend] = None,
+) -> Any:
+    """Estimativa inicial do sinal com `upscale_factor` vezes mais amostras."""
+    backend = backend or backend_for(data)
+    match method:
+        case InterpolationTypes.REPEAT:
+            return backend.xp.repeat(data, upscale_factor, axis=0)
+        case InterpolationTypes.POLYPHASE | InterpolationTypes.SINC:
+            if upscale_factor == 1:
+                return data
+            kernel = interpolation_kernel(method, upscale_factor)
+            return polyphase_interpolate(data, upscale_factor, kernel, backend)
+        case _:
+            raise ValueError(f"Método de interpolação não suportado: {method}")
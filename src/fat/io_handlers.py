@@ -1,52 +1,271 @@
 import os
+import subprocess
+import tempfile
+from typing import Iterator, Optional, Union
 import numpy as np
 import soundfile as sf
-from pydub import AudioSegment
 from mutagen.mp3 import MP3
 from mutagen.flac import FLAC
 from mutagen.oggvorbis import OggVorbis
 from mutagen.wave import WAVE
-from .types import AudioData, NpArray, AudioTypes
+from .decoders import (
+    SOUNDFILE_FORMATS,
+    decode_file,
+    iter_ffmpeg_blocks,
+    probe_audio,
+)
+from .types import (
+    AudioData,
+    AudioStreamInfo,
+    NpArray,
+    AudioTypes,
+    OpusSettings,
+    OutputMetadata,
+)
+
+# Historicamente (pydub) as amostras chegavam na escala de inteiros de 16 bits;
+# o PCM float32 é reescalado para que `threshold_value` mantenha o significado.
+PCM16_SCALE = 32768.0
+
+# O libopus só codifica a 48 kHz (ou taxas menores); a saída é reamostrada.
+OPUS_SAMPLE_RATE = 48_000
+
+# O libsndfile não grava blocos PICTURE nem PADDING no FLAC, mas grava os
+# comentários Vorbis antes do primeiro quadro. Um comentário de preenchimento
+# reserva o espaço que a etapa de tags troca pela capa e pelas tags sem mover
+# o áudio (ver `tag_flac`).
+RESERVED_TAG = "comment"
+
+
+def _uses_ffmpeg(fmt: AudioTypes) -> bool:
+    return str(fmt) not in SOUNDFILE_FORMATS
 
 
 def read_audio(file_path: str, fmt: AudioTypes) -> AudioData:
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
 
-    extra_params = ["-drc_scale", "0"]
-    audio = AudioSegment.from_file(file_path, format=str(fmt), parameters=extra_params)
-    samples = np.array(audio.get_array_of_samples(), dtype=np.float32)
-    sample_rate = audio.frame_rate
+    samples, sample_rate, channels = decode_file(file_path, str(fmt))
+    samples *= PCM16_SCALE
+    return AudioData(
+        sample_rate=sample_rate,
+        samples=samples if channels > 1 else samples[:, 0],
+        bitrate=read_bitrate(file_path, fmt),
+        channels=channels,
+    )
+
+
+def read_stream_info(file_path: str, fmt: AudioTypes) -> AudioStreamInfo:
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
+    if _uses_ffmpeg(fmt):
+        sample_rate, channels, duration = probe_audio(file_path)
+        return AudioStreamInfo(
+            sample_rate=sample_rate,
+            channels=channels,
+            frames=int(duration * sample_rate),
+            bitrate=read_bitrate(file_path, fmt),
+        )
+    info = sf.info(file_path)
+    return AudioStreamInfo(
+        sample_rate=info.samplerate,
+        channels=info.channels,
+        frames=info.frames,
+        bitrate=read_bitrate(file_path, fmt),
+    )
+
+
+def iter_audio_blocks(
+    file_path: str, fmt: AudioTypes, block_size: int, overlap: int = 0
+) -> Iterator[NpArray]:
+    """Lê o arquivo em blocos (n, canais) float32 que compartilham `overlap` amostras."""
+    if _uses_ffmpeg(fmt):
+        sample_rate, channels, _ = probe_audio(file_path)
+        for block in iter_ffmpeg_blocks(
+            file_path, sample_rate, channels, block_size, overlap
+        ):
+            block *= PCM16_SCALE
+            yield block
+        return
+    with sf.SoundFile(file_path) as f:
+        for block in f.blocks(
+            blocksize=block_size, overlap=overlap, dtype="float32", always_2d=True
+        ):
+            block *= PCM16_SCALE
+            yield block
 
+
+def read_bitrate(file_path: str, fmt: AudioTypes) -> Optional[int]:
     match fmt:
         case AudioTypes.MP3:
-            bitrate = MP3(file_path).info.bitrate  # type: ignore
+            return MP3(file_path).info.bitrate  # type: ignore
         case AudioTypes.FLAC:
-            bitrate = FLAC(file_path).info.bitrate
+            return FLAC(file_path).info.bitrate
         case AudioTypes.OGG:
-            bitrate = OggVorbis(file_path).info.bitrate  # type: ignore
+            return OggVorbis(file_path).info.bitrate  # type: ignore
         case AudioTypes.WAV:
-            bitrate = WAVE(file_path).info.bitrate
+            return WAVE(file_path).info.bitrate
         case _:
-            duration = len(audio) / 1000.0
-            bitrate = int((len(samples) * 8) / duration) if duration > 0 else None
+            return None
 
-    if audio.channels == 2:
-        samples = samples.reshape((-1, 2))
 
-    return AudioData(
-        sample_rate=sample_rate, samples=samples, bitrate=bitrate, audio_segment=audio
-    )
+def _ffmpeg_opus_command(
+    file_path: str, sample_rate: int, channels: int, settings: OpusSettings
+) -> list[str]:
+    return [
+        "ffmpeg",
+        "-y",
+        "-v",
+        "error",
+        "-f",
+        "f32le",
+        "-ar",
+        str(sample_rate),
+        "-ac",
+        str(channels),
+        "-i",
+        "pipe:0",
+        "-ar",
+        str(OPUS_SAMPLE_RATE),
+        "-c:a",
+        "libopus",
+        "-b:a",
+        f"{settings.bitrate_kbps}k",
+        "-vbr",
+        "on",
+        "-compression_level",
+        str(settings.complexity),
+        "-frame_duration",
+        f"{settings.frame_ms:g}",
+        "-f",
+        "opus",
+        file_path,
+    ]
+
+
+class OpusWriter:
+    """
+    Codifica PCM (n, canais) em Ogg Opus por um pipe para o ffmpeg/libopus,
+    que reamostra para 48 kHz. Aceita blocos sucessivos, como
+    `soundfile.SoundFile.write`.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        sample_rate: int,
+        channels: int,
+        settings: Optional[OpusSettings] = None,
+    ) -> None:
+        self.channels = channels
+        self._stderr = tempfile.TemporaryFile()
+        try:
+            self._proc = subprocess.Popen(
+                _ffmpeg_opus_command(
+                    file_path, sample_rate, channels, settings or OpusSettings()
+                ),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=self._stderr,
+            )
+        except BaseException:
+            self._stderr.close()
+            raise
+
+    def write(self, data: NpArray) -> None:
+        if data.ndim != 2 or data.shape[1] != self.channels:
+            raise ValueError(
+                f"Forma inválida: {data.shape} (esperados {self.channels} canais)"
+            )
+        # Só converte se preciso (float64); float32 contíguo vai sem cópia.
+        block = np.ascontiguousarray(data, dtype=np.float32)
+        assert self._proc.stdin is not None
+        try:
+            self._proc.stdin.write(memoryview(block).cast("B"))
+        except BrokenPipeError:
+            # O ffmpeg saiu antes: o erro dele é mais útil que o do pipe.
+            self.close()
+            raise
+
+    def close(self) -> None:
+        if self._stderr.closed:
+            return
+        if self._proc.stdin is not None and not self._proc.stdin.closed:
+            self._proc.stdin.close()
+        returncode = self._proc.wait()
+        self._stderr.seek(0)
+        message = self._stderr.read().decode(errors="replace").strip()
+        self._stderr.close()
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, "ffmpeg", stderr=message)
+
+    def __enter__(self) -> "OpusWriter":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def _set_flac_metadata(file: sf.SoundFile, metadata: OutputMetadata) -> None:
+    """Precisa vir antes do primeiro `write`: depois o cabeçalho já foi gravado."""
+    if metadata.title:
+        file.title = metadata.title
+    if metadata.reserved_bytes > 0:
+        setattr(file, RESERVED_TAG, " " * metadata.reserved_bytes)
+
+
+def open_audio_writer(
+    file_path: str,
+    sample_rate: int,
+    channels: int,
+    fmt: AudioTypes,
+    opus: Optional[OpusSettings] = None,
+    metadata: Optional[OutputMetadata] = None,
+) -> Union[sf.SoundFile, OpusWriter]:
+    match fmt:
+        case AudioTypes.OPUS:
+            return OpusWriter(file_path, sample_rate, channels, opus)
+        case AudioTypes.FLAC:
+            file = sf.SoundFile(
+                file_path,
+                "w",
+                samplerate=sample_rate,
+                channels=channels,
+                format="FLAC",
+                subtype="PCM_24",
+                compression_level=1,
+            )
+            if metadata is not None:
+                _set_flac_metadata(file, metadata)
+            return file
+        case AudioTypes.WAV:
+            return sf.SoundFile(
+                file_path,
+                "w",
+                samplerate=sample_rate,
+                channels=channels,
+                format="WAV",
+                subtype="PCM_32",
+            )
+        case _:
+            raise ValueError(f"Formato de saída não suportado: {fmt}")
 
 
 def write_audio(
-    file_path: str, sample_rate: int, data: NpArray, fmt: AudioTypes
+    file_path: str,
+    sample_rate: int,
+    data: NpArray,
+    fmt: AudioTypes,
+    opus: Optional[OpusSettings] = None,
 ) -> None:
     match fmt:
+        case AudioTypes.OPUS:
+            with OpusWriter(file_path, sample_rate, data.shape[1], opus) as writer:
+                writer.write(data)
         case AudioTypes.FLAC:
             sf.write(
                 file_path,
-                data.astype(np.float32),
+                data,
                 sample_rate,
                 format="FLAC",
                 subtype="PCM_24",
@@ -55,7 +274,7 @@ def write_audio(
         case AudioTypes.WAV:
             sf.write(
                 file_path,
-                data.astype(np.float32),
+                data,
                 sample_rate,
                 format="WAV",
                 subtype="PCM_32",
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+import numpy as np
+from .io_handlers import PCM16_SCALE, read_audio
+from .types import AudioData, AudioTypes
+
+# Altere quando a decodificação mudar de forma que invalide o PCM armazenado.
+DECODER_VERSION = 1
+
+
+def source_digest(file_path: str) -> str:
+    with open(file_path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _decoder_settings(fmt: AudioTypes) -> str:
+    return f"{fmt}:{PCM16_SCALE}:{DECODER_VERSION}"
+
+
+def pcm_key(file_path: str, fmt: AudioTypes) -> str:
+    """Chave pelo conteúdo: exige ler o arquivo de origem inteiro."""
+    digest = hashlib.sha256(
+        f"{source_digest(file_path)}:{_decoder_settings(fmt)}".encode()
+    )
+    return digest.hexdigest()
+
+
+def stat_key(file_path: str, fmt: AudioTypes) -> str:
+    """Chave barata por (caminho, tamanho, mtime_ns), sem ler o arquivo."""
+    st = os.stat(file_path)
+    identity = f"{os.path.realpath(file_path)}:{st.st_size}:{st.st_mtime_ns}"
+    digest = hashlib.sha256(f"{identity}:{_decoder_settings(fmt)}".encode())
+    return digest.hexdigest()
+
+
+class PcmStore:
+    """
+    Armazena PCM float32 decodificado como `.npy` mapeável em memória, com um
+    sidecar JSON (taxa de amostragem, canais, bitrate da fonte). A chave é o
+    hash do arquivo de origem mais as configurações do decodificador, então
+    re-execuções sobre a mesma fonte mapeiam o arquivo em vez de decodificar e
+    processos diferentes compartilham as páginas pelo cache do SO. Um `.ref`
+    por `stat_key` aponta para a chave de conteúdo, para que as re-execuções
+    não precisem ler a fonte inteira para calcular o hash.
+    """
+
+    def __init__(self, cache_dir: str) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        return self.cache_dir / f"{key}.npy", self.cache_dir / f"{key}.json"
+
+    def _ref_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.ref"
+
+    def resolve(self, key: str) -> Optional[str]:
+        """Chave de conteúdo registrada para a `stat_key` `key`, se houver."""
+        try:
+            return self._ref_path(key).read_text(encoding="utf-8").strip() or None
+        except OSError:
+            return None
+
+    def link(self, key: str, content_key: str) -> None:
+        ref_path = self._ref_path(key)
+        tmp_ref = ref_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_ref.write_text(content_key, encoding="utf-8")
+        os.replace(tmp_ref, ref_path)
+
+    def load(self, key: str) -> Optional[AudioData]:
+        samples_path, meta_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            samples = np.load(samples_path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        return AudioData(
+            sample_rate=meta["sample_rate"],
+            samples=samples if meta["channels"] > 1 else samples[:, 0],
+            bitrate=meta["bitrate"],
+            channels=meta["channels"],
+        )
+
+    def store(self, key: str, audio: AudioData, source: str) -> AudioData:
+        samples_path, meta_path = self._paths(key)
+        samples = audio.samples.reshape((len(audio.samples), audio.channels))
+        tmp_samples = samples_path.with_suffix(f".{os.getpid()}.tmp.npy")
+        np.save(tmp_samples, samples)
+        os.replace(tmp_samples, samples_path)
+        tmp_meta = meta_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_meta.write_text(
+            json.dumps(
+                {
+                    "sample_rate": audio.sample_rate,
+                    "channels": audio.channels,
+                    "bitrate": audio.bitrate,
+                    "source": source,
+                    "decoder_version": DECODER_VERSION,
+                }
+            ),
+            encoding="utf-8",
+        )
+        os.replace(tmp_meta, meta_path)
+        return self.load(key) or audio
+
+
+def read_audio_cached(file_path: str, fmt: AudioTypes, cache_dir: str) -> AudioData:
+    """
+    `read_audio` com o PCM decodificado persistido em `cache_dir`. A busca
+    usa primeiro a `stat_key`; o hash do conteúdo só é calculado quando ela
+    falha (arquivo novo, movido ou com mtime alterado).
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
+    store = PcmStore(cache_dir)
+    fast_key = stat_key(file_path, fmt)
+    content_key = store.resolve(fast_key)
+    if content_key is not None:
+        cached = store.load(content_key)
+        if cached is not None:
+            return cached
+    content_key = pcm_key(file_path, fmt)
+    cached = store.load(content_key)
+    if cached is None:
+        cached = store.store(content_key, read_audio(file_path, fmt), source=file_path)
+    store.link(fast_key, content_key)
+    return cached
@@ -1,8 +1,31 @@
-import cupy as cp
-from .config import UpscaleConfig, validate_config
+from typing import Any, Optional
+import numpy as np
+from .backend import ArrayBackend, get_backend
+from .config import (
+    UpscaleConfig,
+    validate_config,
+    convergence_criteria,
+    opus_settings,
+    upscale_factor_for,
+    workspace_budget_bytes,
+    working_dtype,
+)
 from .logging_config import logger
 from .gpu_utils import gpu_memory_scope
-from .io_handlers import read_audio, write_audio
+from .io_handlers import read_audio
+from .pcm_cache import read_audio_cached
+from .shared_pcm import SharedPcm, SharedPcmBuffer, create_shared
+from .tracing import array_attrs, span
+from .streaming import upscale_streaming
+from .types import (
+    AudioTypes,
+    BackendTypes,
+    OpusSettings,
+    OutputMetadata,
+    UpscaleResult,
+)
+from .workspace import get_workspace
+from .writer import ChunkedAudioWriter
 from .processing import (
     upscale_channels,
     normalize_signal,
@@ -10,68 +33,197 @@ from .processing import (
 )
 
 
-def prepare_audio(cfg: UpscaleConfig):
-    audio_data = read_audio(cfg.input_file_path, cfg.source_format)
-    samples = cp.array(audio_data.samples, dtype=cp.float32)
-    if audio_data.audio_segment.channels == 2:
-        samples = samples.reshape((-1, 2))
-    target_bitrate = cfg.target_bitrate_kbps * 1000
-    upscale_factor = (
-        round(target_bitrate / audio_data.bitrate) if audio_data.bitrate else 4
-    )
+def prepare_audio(cfg: UpscaleConfig, backend: ArrayBackend):
+    with span("prepare_audio", backend, source=str(cfg.source_format)) as attrs:
+        if cfg.pcm_cache_dir is not None:
+            audio_data = read_audio_cached(
+                cfg.input_file_path, cfg.source_format, cfg.pcm_cache_dir
+            )
+        else:
+            audio_data = read_audio(cfg.input_file_path, cfg.source_format)
+        samples = backend.asarray(
+            audio_data.samples, dtype=working_dtype(cfg, backend.xp)
+        )
+        upscale_factor = upscale_factor_for(cfg, audio_data.bitrate)
+        attrs.update(array_attrs(samples=samples), upscale_factor=upscale_factor)
     return samples, audio_data, upscale_factor
 
 
 def process_channels(
-    channels: cp.ndarray, cfg: UpscaleConfig, upscale_factor: int
-) -> cp.ndarray:
-    upscaled = upscale_channels(
-        channels,
-        upscale_factor=upscale_factor,
-        max_iter=cfg.max_iterations,
-        threshold=cfg.threshold_value,
+    channels: Any, cfg: UpscaleConfig, upscale_factor: int, backend: ArrayBackend
+) -> tuple[Any, int, bool]:
+    xp = backend.xp
+    with span("ist", backend, **array_attrs(channels=channels)) as attrs:
+        ist = upscale_channels(
+            channels,
+            upscale_factor=upscale_factor,
+            max_iter=cfg.max_iterations,
+            threshold=cfg.threshold_value,
+            backend=backend,
+            real_fft=cfg.use_real_fft,
+            convergence=convergence_criteria(cfg),
+            workspace=get_workspace(backend, workspace_budget_bytes(cfg)),
+            padding=cfg.fft_padding,
+            interpolation=cfg.interpolation,
+        )
+        attrs.update(iterations=ist.iterations, converged=ist.converged)
+    logger.info(
+        f"IST: {ist.iterations}/{cfg.max_iterations} iterações"
+        + (" (convergiu)" if ist.converged else "")
     )
+    upscaled, iterations, converged = ist.data, ist.iterations, ist.converged
+    del ist
     if cfg.toggle_autoscale:
-        upscaled = cp.column_stack(
-            [
-                normalize_signal(upscaled[:, i]) * cp.max(cp.abs(channels[:, i]))
-                for i in range(channels.shape[1])
-            ]
-        )
+        with span("autoscale", backend, **array_attrs(upscaled=upscaled)):
+            upscaled = xp.column_stack(
+                [
+                    normalize_signal(upscaled[:, i], backend)
+                    * xp.max(xp.abs(channels[:, i]))
+                    for i in range(channels.shape[1])
+                ]
+            )
     if cfg.toggle_normalize:
-        upscaled = cp.column_stack(
-            [normalize_signal(upscaled[:, i]) for i in range(upscaled.shape[1])]
-        )
+        with span("normalize", backend, **array_attrs(upscaled=upscaled)):
+            upscaled = xp.column_stack(
+                [
+                    normalize_signal(upscaled[:, i], backend)
+                    for i in range(upscaled.shape[1])
+                ]
+            )
     if cfg.toggle_adaptive_filter:
-        stak = [
-            lms_filter(upscaled[:, i], upscaled[:, i]) for i in range(upscaled.shape[1])
-        ]
-        upscaled = cp.column_stack(stak)
-    return upscaled
+        with span("lms", backend, **array_attrs(upscaled=upscaled)):
+            stak = [
+                lms_filter(upscaled[:, i], upscaled[:, i], backend=backend)
+                for i in range(upscaled.shape[1])
+            ]
+            upscaled = xp.column_stack(stak)
+    return upscaled, iterations, converged
 
 
 def write_output(
-    cfg: UpscaleConfig, audio_data, upscaled: cp.ndarray, upscale_factor: int
+    cfg: UpscaleConfig,
+    audio_data,
+    upscaled: Any,
+    upscale_factor: int,
+    backend: ArrayBackend,
 ) -> None:
     new_sample_rate = audio_data.sample_rate * upscale_factor
-    final_audio = cp.asnumpy(upscaled)
-    write_audio(
-        cfg.output_file_path,
-        new_sample_rate,
-        final_audio,
-        cfg.target_format,
-    )
-    del final_audio
+    with (
+        span("write_output", backend, target=str(cfg.target_format)) as attrs,
+        ChunkedAudioWriter(
+            cfg.output_file_path,
+            new_sample_rate,
+            upscaled.shape[1],
+            cfg.target_format,
+            backend,
+            cfg.write_block_frames,
+            opus=opus_settings(cfg),
+            metadata=cfg.metadata,
+        ) as writer,
+    ):
+        writer.write(upscaled)
+        attrs.update(array_attrs(output=upscaled))
 
 
-def upscale(cfg: UpscaleConfig) -> None:
+def upscale(cfg: UpscaleConfig) -> UpscaleResult:
     validate_config(cfg)
+    if cfg.streaming:
+        return upscale_streaming(cfg)
+    backend = get_backend(cfg.backend, cfg.fft_workers)
+    logger.info(f"Backend de processamento: {backend.kind}")
     logger.info(f"Lendo arquivo {cfg.input_file_path} ({cfg.source_format})...")
-    samples, audio_data, upscale_factor = prepare_audio(cfg)
+    samples, audio_data, upscale_factor = prepare_audio(cfg, backend)
     logger.info(f"Fator de upscaling: {upscale_factor}")
-    channels = samples[:, cp.newaxis] if samples.ndim == 1 else samples
+    channels = samples[:, backend.xp.newaxis] if samples.ndim == 1 else samples
     logger.info("Processando e upscaling dos canais...")
-    with gpu_memory_scope(samples, channels):
-        upscaled = process_channels(channels, cfg, upscale_factor)
-        write_output(cfg, audio_data, upscaled, upscale_factor)
-    logger.info("Arquivo salvo e memória GPU liberada.")
+    with gpu_memory_scope(backend, samples, channels):
+        upscaled, iterations, converged = process_channels(
+            channels, cfg, upscale_factor, backend
+        )
+        write_output(cfg, audio_data, upscaled, upscale_factor, backend)
+    logger.info("Arquivo salvo e memória do backend liberada.")
+    return UpscaleResult(
+        output_file_path=cfg.output_file_path,
+        upscale_factor=upscale_factor,
+        ist_iterations=iterations,
+        converged=converged,
+        duration_seconds=len(samples) / audio_data.sample_rate,
+    )
+
+
+def shared_output_for(cfg: UpscaleConfig, pcm: SharedPcm) -> SharedPcm:
+    """
+    Segmento de saída de `upscale_shared` para a entrada `pcm`. É criado pelo
+    chamador, que o mantém aberto enquanto o processo de DSP o preenche, o
+    grava com `write_shared` e o libera com `release_shared`.
+    """
+    upscale_factor = upscale_factor_for(cfg, pcm.bitrate)
+    return create_shared(
+        (pcm.shape[0] * upscale_factor, pcm.shape[1]),
+        pcm.sample_rate * upscale_factor,
+        dtype=np.dtype(working_dtype(cfg, np)).name,
+    )
+
+
+def upscale_shared(
+    cfg: UpscaleConfig, pcm: SharedPcm, output: SharedPcm
+) -> UpscaleResult:
+    """
+    Como `upscale`, mas lê as amostras já decodificadas do segmento `pcm` e
+    deixa o resultado no segmento `output` (de `shared_output_for`) em vez
+    de gravar o arquivo: entre processos só trafegam os descritores.
+    """
+    validate_config(cfg)
+    backend = get_backend(cfg.backend, cfg.fft_workers)
+    upscale_factor = upscale_factor_for(cfg, pcm.bitrate)
+    logger.info(
+        f"Upscaling de memória compartilhada ({backend.kind}): fator {upscale_factor}"
+    )
+    with SharedPcmBuffer.attach(pcm) as source:
+        channels = backend.asarray(source.array, dtype=working_dtype(cfg, backend.xp))
+        with gpu_memory_scope(backend, channels):
+            upscaled, iterations, converged = process_channels(
+                channels, cfg, upscale_factor, backend
+            )
+            del channels
+            if upscaled.shape != output.shape or upscaled.dtype != output.dtype:
+                raise ValueError(
+                    f"Saída {upscaled.shape} {upscaled.dtype} não cabe no segmento "
+                    f"{output.shape} {output.dtype}"
+                )
+            with SharedPcmBuffer.attach(output) as target:
+                target.array[...] = backend.asnumpy(upscaled)
+            del upscaled
+    return UpscaleResult(
+        output_file_path=cfg.output_file_path,
+        upscale_factor=upscale_factor,
+        ist_iterations=iterations,
+        converged=converged,
+        duration_seconds=pcm.shape[0] / pcm.sample_rate,
+    )
+
+
+def write_shared(
+    file_path: str,
+    fmt: AudioTypes,
+    pcm: SharedPcm,
+    opus: Optional[OpusSettings] = None,
+    metadata: Optional[OutputMetadata] = None,
+) -> None:
+    with (
+        span("write_output", target=str(fmt)) as attrs,
+        SharedPcmBuffer.attach(pcm) as upscaled,
+    ):
+        # Os blocos são visões do segmento: gravados sem cópia.
+        with ChunkedAudioWriter(
+            file_path,
+            pcm.sample_rate,
+            pcm.shape[1],
+            fmt,
+            get_backend(BackendTypes.NUMPY),
+            opus=opus,
+            metadata=metadata,
+        ) as writer:
+            writer.write(upscaled.array)
+        attrs.update(array_attrs(output=upscaled.array))
+    logger.info(f"Arquivo salvo: {file_path}")
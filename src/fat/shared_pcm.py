@@ -0,0 +1,207 @@
+import os
+import shutil
+import subprocess
+from dataclasses import dataclass, replace
+from multiprocessing import shared_memory
+from typing import Optional
+import numpy as np
+import soundfile as sf
+from .decoders import SOUNDFILE_FORMATS, _ffmpeg_command, probe_audio
+from .io_handlers import PCM16_SCALE, read_bitrate
+from .types import AudioTypes, NpArray
+
+# Segmentos criados por este processo, com o handle aberto até
+# `release_shared`: no Windows o segmento é destruído quando o último handle
+# fecha, então quem cria não pode fechá-lo antes de o consumidor se conectar.
+_held: dict[str, shared_memory.SharedMemory] = {}
+
+# Onde o Linux cria os segmentos. O espaço é limitado (64 MB por padrão em
+# contêineres Docker) e um segmento maior que o livre é criado mesmo assim:
+# a falta só aparece como SIGBUS ao escrever nas páginas.
+_SHM_DIR = "/dev/shm"
+
+
+class SharedMemoryFull(MemoryError):
+    """O segmento pedido não cabe no espaço livre de /dev/shm."""
+
+
+def shared_free_bytes() -> Optional[int]:
+    """Espaço livre para segmentos; None se não há /dev/shm (Windows, macOS)."""
+    if not os.path.isdir(_SHM_DIR):
+        return None
+    return shutil.disk_usage(_SHM_DIR).free
+
+
+@dataclass(frozen=True, slots=True)
+class SharedPcm:
+    """
+    Descritor de PCM em memória compartilhada: só isto atravessa o pipe entre
+    processos, nunca as amostras.
+    """
+
+    name: str
+    shape: tuple[int, int]
+    sample_rate: int
+    bitrate: Optional[float] = None
+    dtype: str = "float32"
+
+
+class SharedPcmBuffer:
+    """
+    Segmento `SharedMemory` visto como array (n, canais). Quem cria o
+    segmento (ou o último estágio a usá-lo) chama `unlink`; os demais só
+    fazem `close`. O array deixa de ser válido depois de `close`.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, pcm: SharedPcm) -> None:
+        self._shm = shm
+        self.pcm = pcm
+        self.array: NpArray = np.ndarray(pcm.shape, dtype=pcm.dtype, buffer=shm.buf)
+
+    @classmethod
+    def create(
+        cls,
+        shape: tuple[int, int],
+        sample_rate: int,
+        bitrate: Optional[float] = None,
+        dtype: str = "float32",
+    ) -> "SharedPcmBuffer":
+        nbytes = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+        free = shared_free_bytes()
+        if free is not None and nbytes > free:
+            raise SharedMemoryFull(
+                f"Segmento de {nbytes} bytes não cabe em {_SHM_DIR} "
+                f"({free} bytes livres)."
+            )
+        shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        return cls(shm, SharedPcm(shm.name, shape, sample_rate, bitrate, dtype))
+
+    @classmethod
+    def attach(cls, pcm: SharedPcm) -> "SharedPcmBuffer":
+        return cls(shared_memory.SharedMemory(name=pcm.name), pcm)
+
+    def truncate(self, frames: int) -> None:
+        """Reduz o número de amostras visíveis (o segmento não encolhe)."""
+        self.pcm = replace(self.pcm, shape=(frames, self.pcm.shape[1]))
+        self.array = np.ndarray(
+            self.pcm.shape, dtype=self.pcm.dtype, buffer=self._shm.buf
+        )
+
+    def close(self) -> None:
+        del self.array
+        self._shm.close()
+
+    def unlink(self) -> None:
+        self._shm.unlink()
+
+    def hold(self) -> SharedPcm:
+        """Solta o array e mantém o segmento aberto até `release_shared`."""
+        del self.array
+        _held[self.pcm.name] = self._shm
+        return self.pcm
+
+    def __enter__(self) -> "SharedPcmBuffer":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def release_shared(pcm: Optional[SharedPcm]) -> None:
+    """Libera o segmento de `pcm`; segura para segmentos já liberados."""
+    if pcm is None:
+        return
+    held = _held.pop(pcm.name, None)
+    if held is not None:
+        held.close()
+        held.unlink()
+        return
+    try:
+        segment = shared_memory.SharedMemory(name=pcm.name)
+    except FileNotFoundError:
+        return
+    segment.close()
+    segment.unlink()
+
+
+def create_shared(
+    shape: tuple[int, int],
+    sample_rate: int,
+    bitrate: Optional[float] = None,
+    dtype: str = "float32",
+) -> SharedPcm:
+    """
+    Cria um segmento para outro processo preencher; este processo o mantém
+    aberto até `release_shared`.
+    """
+    return SharedPcmBuffer.create(shape, sample_rate, bitrate, dtype).hold()
+
+
+def _ffmpeg_into_shared(
+    file_path: str, sample_rate: int, channels: int, duration: float
+) -> SharedPcmBuffer:
+    frame_bytes = 4 * channels
+    frames = max(int(duration * sample_rate * 1.01) + sample_rate, 1)
+    buffer = SharedPcmBuffer.create((frames, channels), sample_rate)
+    filled = 0
+    try:
+        with subprocess.Popen(
+            _ffmpeg_command(file_path, sample_rate, channels),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        ) as proc:
+            assert proc.stdout is not None
+            while True:
+                if filled == buffer.array.nbytes:
+                    # Duração subestimada: cresce 50% (uma cópia, caso raro).
+                    grown = SharedPcmBuffer.create(
+                        (len(buffer.array) * 3 // 2, channels), sample_rate
+                    )
+                    grown.array[: len(buffer.array)] = buffer.array
+                    buffer.close()
+                    buffer.unlink()
+                    buffer = grown
+                    continue
+                with memoryview(buffer.array).cast("B") as view:
+                    read = proc.stdout.readinto(view[filled:])  # type: ignore
+                if not read:
+                    break
+                filled += read
+            proc.stdout.close()
+            if proc.wait() != 0:
+                raise subprocess.CalledProcessError(proc.returncode, "ffmpeg")
+    except BaseException:
+        buffer.close()
+        buffer.unlink()
+        raise
+    buffer.truncate(filled // frame_bytes)
+    return buffer
+
+
+def decode_to_shared(file_path: str, fmt: AudioTypes) -> SharedPcm:
+    """
+    Decodifica `file_path` direto para um segmento compartilhado, na escala
+    de `read_audio`. O chamador é dono do segmento e deve liberá-lo com
+    `release_shared`.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
+    if str(fmt) in SOUNDFILE_FORMATS:
+        info = sf.info(file_path)
+        buffer = SharedPcmBuffer.create((info.frames, info.channels), info.samplerate)
+        try:
+            read = sf.read(
+                file_path, dtype="float32", always_2d=True, out=buffer.array
+            )[0]
+            buffer.truncate(len(read))
+            del read
+        except BaseException:
+            buffer.close()
+            buffer.unlink()
+            raise
+    else:
+        sample_rate, channels, duration = probe_audio(file_path)
+        buffer = _ffmpeg_into_shared(file_path, sample_rate, channels, duration)
+    buffer.array *= PCM16_SCALE
+    buffer.pcm = replace(buffer.pcm, bitrate=read_bitrate(file_path, fmt))
+    return buffer.hold()
@@ -0,0 +1,202 @@
+from typing import Any, Optional
+import numpy as np
+from .backend import ArrayBackend, get_backend
+from .config import (
+    UpscaleConfig,
+    convergence_criteria,
+    opus_settings,
+    upscale_factor_for,
+    workspace_budget_bytes,
+    working_dtype,
+)
+from .io_handlers import iter_audio_blocks, read_stream_info
+from .logging_config import logger
+from .processing import StreamingLMS, upscale_channels
+from .types import NpArray, UpscaleResult
+from .workspace import get_workspace
+from .writer import ChunkedAudioWriter
+
+
+class OverlapAdd:
+    """
+    Junta janelas consecutivas que compartilham `overlap` amostras com um
+    crossfade linear (os pesos somam 1 na região sobreposta).
+    """
+
+    def __init__(self, overlap: int, backend: ArrayBackend) -> None:
+        self.overlap = overlap
+        self.backend = backend
+        self.tail: Optional[Any] = None
+
+    def push(self, block: Any) -> Any:
+        xp = self.backend.xp
+        if self.overlap == 0:
+            return block
+        if self.tail is not None:
+            ramp = xp.linspace(0, 1, self.overlap, dtype=block.dtype)[:, xp.newaxis]
+            head = self.tail * (1 - ramp) + block[: self.overlap] * ramp
+            block = xp.concatenate([head, block[self.overlap :]])
+        self.tail = block[-self.overlap :]
+        return block[: -self.overlap]
+
+    def flush(self) -> Optional[Any]:
+        tail, self.tail = self.tail, None
+        return tail
+
+
+class AutoscaleGain:
+    """
+    Ganho do autoscale por canal (pico de entrada / pico de saída), fixado na
+    primeira janela em que o canal tem sinal e aplicado igual às seguintes.
+    Recalculado a cada janela, o ganho mudaria em degraus nas emendas; no
+    modo em memória ele também é um só para a faixa inteira. Como vem de uma
+    janela e não da faixa toda, o pico de saída só aproxima o de entrada.
+    Canais ainda em silêncio passam com ganho 1.
+    """
+
+    def __init__(self, backend: ArrayBackend) -> None:
+        self.backend = backend
+        self.gain: Optional[Any] = None
+        self.known: Optional[Any] = None
+
+    def apply(self, upscaled: Any, window: Any) -> Any:
+        xp = self.backend.xp
+        if self.gain is None:
+            self.gain = xp.ones(upscaled.shape[1], dtype=upscaled.dtype)
+            self.known = xp.zeros(upscaled.shape[1], dtype=bool)
+        input_peak = xp.max(xp.abs(window), axis=0)
+        output_peak = xp.max(xp.abs(upscaled), axis=0)
+        fresh = ~self.known & (input_peak > 0) & (output_peak > 0)
+        self.gain = xp.where(fresh, input_peak / _safe_peak(upscaled, xp), self.gain)
+        self.known |= fresh
+        return upscaled * self.gain
+
+
+def scan_peaks(cfg: UpscaleConfig) -> NpArray:
+    """Primeira passada (só decodificação): pico absoluto de cada canal."""
+    peaks = None
+    for block in iter_audio_blocks(
+        cfg.input_file_path, cfg.source_format, cfg.stream_window_frames
+    ):
+        block_peaks = np.abs(block).max(axis=0)
+        peaks = block_peaks if peaks is None else np.maximum(peaks, block_peaks)
+    if peaks is None:
+        raise ValueError("Sinal vazio não pode ser normalizado.")
+    return peaks
+
+
+def process_window(
+    window: Any,
+    cfg: UpscaleConfig,
+    upscale_factor: int,
+    backend: ArrayBackend,
+    peaks: Optional[Any],
+    gain: Optional[AutoscaleGain],
+) -> tuple[Any, int]:
+    """
+    Upscaling de uma janela. O autoscale aplica o ganho fixo de `gain`; a
+    normalização divide pelo pico global de entrada medido em `scan_peaks`
+    (ou, sem autoscale, pelo pico da própria janela).
+    """
+    xp = backend.xp
+    ist = upscale_channels(
+        window,
+        upscale_factor=upscale_factor,
+        max_iter=cfg.max_iterations,
+        threshold=cfg.threshold_value,
+        backend=backend,
+        real_fft=cfg.use_real_fft,
+        convergence=convergence_criteria(cfg),
+        workspace=get_workspace(backend, workspace_budget_bytes(cfg)),
+        padding=cfg.fft_padding,
+        interpolation=cfg.interpolation,
+    )
+    upscaled, iterations = ist.data, ist.iterations
+    del ist
+    if gain is not None:
+        upscaled = gain.apply(upscaled, window)
+    if cfg.toggle_normalize:
+        reference = peaks if gain is not None else _safe_peak(upscaled, xp)
+        upscaled = upscaled / reference
+    return upscaled, iterations
+
+
+def _safe_peak(data: Any, xp: Any) -> Any:
+    peak = xp.max(xp.abs(data), axis=0)
+    return xp.where(peak > 0, peak, 1)
+
+
+def upscale_streaming(cfg: UpscaleConfig) -> UpscaleResult:
+    """
+    Upscaling em fluxo: janelas de `stream_window_frames` amostras com
+    `stream_overlap_frames` de sobreposição são decodificadas, processadas,
+    unidas por overlap-add e gravadas no arquivo aberto assim que ficam
+    prontas. O pico de memória depende do tamanho da janela, não da faixa.
+    """
+    backend = get_backend(cfg.backend, cfg.fft_workers)
+    info = read_stream_info(cfg.input_file_path, cfg.source_format)
+    upscale_factor = upscale_factor_for(cfg, info.bitrate)
+    logger.info(
+        f"Upscaling em fluxo ({backend.kind}): fator {upscale_factor}, "
+        f"janela {cfg.stream_window_frames}, sobreposição {cfg.stream_overlap_frames}"
+    )
+    dtype = working_dtype(cfg, backend.xp)
+    peaks = None
+    if cfg.toggle_autoscale and cfg.toggle_normalize:
+        peaks = backend.asarray(scan_peaks(cfg), dtype=dtype)
+        peaks = backend.xp.where(peaks > 0, peaks, 1)
+    gain = AutoscaleGain(backend) if cfg.toggle_autoscale else None
+
+    ola = OverlapAdd(cfg.stream_overlap_frames * upscale_factor, backend)
+    lms = StreamingLMS(info.channels, backend) if cfg.toggle_adaptive_filter else None
+    max_iterations = 0
+    with ChunkedAudioWriter(
+        cfg.output_file_path,
+        info.sample_rate * upscale_factor,
+        info.channels,
+        cfg.target_format,
+        backend,
+        cfg.write_block_frames,
+        opus=opus_settings(cfg),
+        metadata=cfg.metadata,
+    ) as writer:
+
+        def emit(block: Optional[Any]) -> None:
+            if block is None:
+                return
+            if lms is not None:
+                block = lms.push(block)
+            if len(block):
+                writer.write(block)
+
+        for window in iter_audio_blocks(
+            cfg.input_file_path,
+            cfg.source_format,
+            cfg.stream_window_frames,
+            cfg.stream_overlap_frames,
+        ):
+            upscaled, iterations = process_window(
+                backend.asarray(window, dtype=dtype),
+                cfg,
+                upscale_factor,
+                backend,
+                peaks,
+                gain,
+            )
+            max_iterations = max(max_iterations, iterations)
+            emit(ola.push(upscaled))
+        emit(ola.flush())
+        if lms is not None:
+            tail = lms.flush()
+            if tail is not None and len(tail):
+                writer.write(tail)
+    backend.synchronize()
+    get_workspace(backend).trim()
+    logger.info(f"Arquivo salvo em fluxo: {cfg.output_file_path}")
+    return UpscaleResult(
+        output_file_path=cfg.output_file_path,
+        upscale_factor=upscale_factor,
+        ist_iterations=max_iterations,
+        converged=max_iterations < cfg.max_iterations,
+        duration_seconds=info.frames / info.sample_rate,
+    )
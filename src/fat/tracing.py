@@ -0,0 +1,190 @@
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+from .backend import ArrayBackend
+
+try:
+    import pyinstrument
+except ImportError:  # o perfil usa cProfile
+    pyinstrument = None
+
+try:
+    import resource
+except ImportError:  # Windows: spans sem os campos de RSS
+    resource = None
+
+# Configuração por variáveis de ambiente para que os processos de DSP
+# (iniciados com spawn) herdem o destino dos spans e o alvo do perfil.
+TRACE_ENV = "YOUTUBE2OPUS_TRACE"
+PROFILE_ENV = "YOUTUBE2OPUS_PROFILE"
+PROFILE_DIR_ENV = "YOUTUBE2OPUS_PROFILE_DIR"
+
+_trace_id: ContextVar[Optional[str]] = ContextVar("trace_id", default=None)
+_parent: ContextVar[Optional[str]] = ContextVar("parent_span", default=None)
+_lock = threading.Lock()
+
+
+def configure_tracing(
+    path: Optional[str],
+    profile_target: Optional[str] = None,
+    profile_dir: str = "./profiles",
+) -> None:
+    """
+    Ativa a emissão de spans em `path` (JSON lines; `None` desativa) e,
+    opcionalmente, o perfil do link cujo trace ID (ID do vídeo) é
+    `profile_target`.
+    """
+    for name, value in (
+        (TRACE_ENV, path),
+        (PROFILE_ENV, profile_target),
+        (PROFILE_DIR_ENV, profile_dir if profile_target else None),
+    ):
+        if value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = value
+
+
+def tracing_enabled() -> bool:
+    return bool(os.environ.get(TRACE_ENV))
+
+
+def new_trace_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+@contextmanager
+def trace_context(trace_id: Optional[str]) -> Iterator[Optional[str]]:
+    """Associa os spans abertos neste contexto (thread/processo) a `trace_id`."""
+    token = _trace_id.set(trace_id or _trace_id.get() or new_trace_id())
+    try:
+        yield _trace_id.get()
+    finally:
+        _trace_id.reset(token)
+
+
+def current_trace_id() -> Optional[str]:
+    return _trace_id.get()
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _emit(record: dict[str, Any]) -> None:
+    path = os.environ.get(TRACE_ENV)
+    if not path:
+        return
+    line = (json.dumps(record, default=str) + "\n").encode()
+    with _lock:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+
+@contextmanager
+def span(
+    name: str, backend: Optional[ArrayBackend] = None, **attrs: Any
+) -> Iterator[dict[str, Any]]:
+    """
+    Mede um trecho: tempo de parede, tempo de CPU do processo, pico de RSS,
+    bytes no pool do dispositivo e FFTs executadas pelo `backend`. O dict
+    retornado aceita atributos extras (tamanhos, iterações) até o fim do
+    bloco. Sem `configure_tracing`, nada é medido nem gravado.
+    """
+    if not tracing_enabled():
+        yield attrs
+        return
+    parent = _parent.get()
+    parent_token = _parent.set(name)
+    ffts_before = backend.fft_calls if backend is not None else 0
+    rss_before = _peak_rss_bytes()
+    start, wall, cpu = time.time(), time.perf_counter(), time.process_time()
+    error = None
+    try:
+        yield attrs
+    except BaseException as exc:
+        error = repr(exc)
+        raise
+    finally:
+        if backend is not None:
+            backend.synchronize()
+        wall_s, cpu_s = time.perf_counter() - wall, time.process_time() - cpu
+        _parent.reset(parent_token)
+        peak = _peak_rss_bytes()
+        record = {
+            "trace_id": _trace_id.get(),
+            "span": name,
+            "parent": parent,
+            "start": start,
+            "wall_s": wall_s,
+            "cpu_s": cpu_s,
+            "pid": os.getpid(),
+            "thread": threading.current_thread().name,
+        }
+        if peak is not None and rss_before is not None:
+            record["peak_rss_bytes"] = peak
+            record["rss_growth_bytes"] = peak - rss_before
+        if backend is not None:
+            record["backend"] = str(backend.kind)
+            record["device_bytes"] = backend.used_bytes()
+            record["ffts"] = backend.fft_calls - ffts_before
+        if error is not None:
+            record["error"] = error
+        _emit({**record, **attrs})
+
+
+def array_attrs(**arrays: Any) -> dict[str, Any]:
+    """Forma e bytes de cada array, para anexar a um span."""
+    attrs: dict[str, Any] = {}
+    for name, arr in arrays.items():
+        if arr is not None:
+            attrs[f"{name}_shape"] = list(arr.shape)
+            attrs[f"{name}_bytes"] = int(arr.nbytes)
+    return attrs
+
+
+@contextmanager
+def profiled(label: str) -> Iterator[None]:
+    """
+    Perfila o bloco se o trace atual é o alvo de `configure_tracing`
+    (pyinstrument se instalado, senão cProfile) e grava o resultado em
+    `<dir>/<trace_id>-<label>-<pid>`.
+    """
+    trace_id = _trace_id.get()
+    target = os.environ.get(PROFILE_ENV)
+    if not target or trace_id != target:
+        yield
+        return
+    directory = os.environ.get(PROFILE_DIR_ENV, "./profiles")
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, f"{trace_id}-{label}-{os.getpid()}")
+    if pyinstrument is not None:
+        profiler = pyinstrument.Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            with open(base + ".html", "w", encoding="utf-8") as f:
+                f.write(profiler.output_html())
+        return
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        profile.dump_stats(base + ".prof")
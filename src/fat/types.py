@@ -1,6 +1,5 @@
-from typing import Optional, TypeAlias
+from typing import Any, Optional, TypeAlias
 from dataclasses import dataclass
-from pydub import AudioSegment
 from enum import Enum, auto
 import numpy as np
 
@@ -12,6 +11,9 @@ class AudioTypes(Enum):
     WAV = auto()
     FLAC = auto()
     OGG = auto()
+    WEBM = auto()
+    M4A = auto()
+    OPUS = auto()
 
     def __str__(self) -> str:
         match self:
@@ -23,13 +25,137 @@ class AudioTypes(Enum):
                 return "flac"
             case self.OGG:
                 return "ogg"
+            case self.WEBM:
+                return "webm"
+            case self.M4A:
+                return "m4a"
+            case self.OPUS:
+                return "opus"
+            case _:
+                return "Desconhecido"
+
+
+class BackendTypes(Enum):
+    AUTO = auto()
+    NUMPY = auto()
+    CUPY = auto()
+
+    def __str__(self) -> str:
+        match self:
+            case self.AUTO:
+                return "auto"
+            case self.NUMPY:
+                return "numpy"
+            case self.CUPY:
+                return "cupy"
+            case _:
+                return "Desconhecido"
+
+
+class InterpolationTypes(Enum):
+    REPEAT = auto()
+    POLYPHASE = auto()
+    SINC = auto()
+
+    def __str__(self) -> str:
+        match self:
+            case self.REPEAT:
+                return "repeat"
+            case self.POLYPHASE:
+                return "polyphase"
+            case self.SINC:
+                return "sinc"
+            case _:
+                return "Desconhecido"
+
+
+class FFTPaddingTypes(Enum):
+    NONE = auto()
+    FAST = auto()
+    BUCKET = auto()
+
+    def __str__(self) -> str:
+        match self:
+            case self.NONE:
+                return "none"
+            case self.FAST:
+                return "fast"
+            case self.BUCKET:
+                return "bucket"
+            case _:
+                return "Desconhecido"
+
+
+class PrecisionTypes(Enum):
+    FLOAT32 = auto()
+    FLOAT64 = auto()
+
+    def __str__(self) -> str:
+        match self:
+            case self.FLOAT32:
+                return "float32"
+            case self.FLOAT64:
+                return "float64"
             case _:
                 return "Desconhecido"
 
 
+@dataclass(frozen=True)
+class OpusSettings:
+    bitrate_kbps: int = 160
+    complexity: int = 10
+    frame_ms: float = 20.0
+
+
+@dataclass(frozen=True)
+class OutputMetadata:
+    """
+    Metadados gravados junto com o áudio (só FLAC): o título e
+    `reserved_bytes` de espaço no cabeçalho para a capa e as demais tags.
+    """
+
+    title: Optional[str] = None
+    reserved_bytes: int = 0
+
+
 @dataclass(frozen=True)
 class AudioData:
     sample_rate: int
     samples: NpArray
     bitrate: Optional[int]
-    audio_segment: AudioSegment
+    channels: int
+
+
+@dataclass(frozen=True)
+class AudioStreamInfo:
+    sample_rate: int
+    channels: int
+    frames: int
+    bitrate: Optional[int]
+
+
+@dataclass(frozen=True)
+class ConvergenceCriteria:
+    tolerance: Optional[float] = None
+    max_support_change: Optional[int] = None
+    check_interval: int = 50
+
+    @property
+    def enabled(self) -> bool:
+        return self.tolerance is not None or self.max_support_change is not None
+
+
+@dataclass(frozen=True)
+class ISTResult:
+    data: Any
+    iterations: int
+    converged: bool
+
+
+@dataclass(frozen=True)
+class UpscaleResult:
+    output_file_path: str
+    upscale_factor: int
+    ist_iterations: int
+    converged: bool
+    duration_seconds: float = 0.0
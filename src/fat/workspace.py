@@ -0,0 +1,127 @@
+from collections import OrderedDict
+from typing import Any, Optional
+from .backend import ArrayBackend
+from .logging_config import logger
+
+# Entradas do cache de planos de FFT do CuPy: o IST usa um tamanho por faixa
+# (direta e inversa), então algumas faixas de tamanhos diferentes cabem.
+_MIN_PLAN_CACHE = 8
+
+
+class FFTWorkspace:
+    """
+    Planos de FFT e buffers de trabalho reutilizados entre canais e faixas
+    com o mesmo comprimento. Os buffers ficam em um LRU por (nome, forma,
+    dtype); quando a soma deles (ou o pool do dispositivo) passa de
+    `budget_bytes`, os menos usados são descartados, em vez de esvaziar tudo
+    a cada faixa. `peak_bytes` guarda o maior uso observado.
+    """
+
+    def __init__(self, backend: ArrayBackend, budget_bytes: Optional[int]) -> None:
+        self.backend = backend
+        self.budget_bytes = budget_bytes
+        self._buffers: OrderedDict[tuple, Any] = OrderedDict()
+        self._lengths: set[int] = set()
+        self.bytes = 0
+        self.peak_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def buffer(self, name: str, shape: tuple[int, ...], dtype: Any) -> Any:
+        """Buffer de trabalho (conteúdo indefinido) reaproveitado entre chamadas."""
+        key = (name, tuple(shape), self.backend.xp.dtype(dtype).str)
+        cached = self._buffers.get(key)
+        if cached is not None:
+            self._buffers.move_to_end(key)
+            self.hits += 1
+            return cached
+        self.misses += 1
+        array = self.backend.xp.empty(shape, dtype=dtype)
+        self._buffers[key] = array
+        self.bytes += array.nbytes
+        self._observe()
+        self._evict(keep=key)
+        return array
+
+    def register_length(self, length: int) -> None:
+        """Garante espaço no cache de planos para mais um comprimento de FFT."""
+        if length in self._lengths:
+            return
+        self._lengths.add(length)
+        self.backend.set_plan_cache_size(max(_MIN_PLAN_CACHE, 2 * len(self._lengths)))
+
+    def _observe(self) -> None:
+        # No CuPy os buffers já estão contidos no pool reservado.
+        reserved = max(self.bytes, self.backend.reserved_bytes())
+        self.peak_bytes = max(self.peak_bytes, reserved)
+
+    def _usage(self) -> int:
+        # No CuPy os buffers contam no pool junto com o resto das alocações.
+        return max(self.bytes, self.backend.used_bytes())
+
+    def _evict(self, keep: Optional[tuple] = None) -> None:
+        if self.budget_bytes is None:
+            return
+        for key in list(self._buffers):
+            if self._usage() <= self.budget_bytes:
+                break
+            if key == keep:
+                continue
+            self.bytes -= self._buffers.pop(key).nbytes
+            self.evictions += 1
+
+    def trim(self) -> None:
+        """
+        Fim de uma faixa: descarta os buffers menos usados até o uso (dos
+        buffers ou do pool do dispositivo) caber no orçamento, e só devolve
+        o pool se ele ainda estiver acima dele.
+        """
+        self._observe()
+        self._evict()
+        if self.budget_bytes is None:
+            return
+        if self.backend.reserved_bytes() > self.budget_bytes:
+            self.backend.synchronize()
+            self.backend.free_memory()
+        if self.backend.used_bytes() > self.budget_bytes:
+            logger.info("Orçamento de memória excedido: limpando planos de FFT.")
+            self._lengths.clear()
+            self.backend.clear_plan_cache()
+            self.backend.free_memory()
+
+    def clear(self) -> None:
+        self._buffers.clear()
+        self._lengths.clear()
+        self.bytes = 0
+        self.backend.clear_plan_cache()
+        self.backend.free_memory()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "bytes": self.bytes,
+            "peak_bytes": self.peak_bytes,
+            "buffers": len(self._buffers),
+            "fft_lengths": len(self._lengths),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+_workspaces: dict[int, FFTWorkspace] = {}
+
+
+def get_workspace(
+    backend: ArrayBackend, budget_bytes: Optional[int] = None
+) -> FFTWorkspace:
+    """
+    Workspace do processo para `backend` (um por backend, como `get_backend`).
+    Passar `budget_bytes` atualiza o orçamento do workspace existente.
+    """
+    workspace = _workspaces.get(id(backend))
+    if workspace is None:
+        workspace = _workspaces[id(backend)] = FFTWorkspace(backend, budget_bytes)
+    elif budget_bytes is not None:
+        workspace.budget_bytes = budget_bytes
+    return workspace
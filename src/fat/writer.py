@@ -0,0 +1,121 @@
+import queue
+import threading
+from typing import Any, Optional
+from .backend import ArrayBackend
+from .io_handlers import open_audio_writer
+from .types import AudioTypes, NpArray, OpusSettings, OutputMetadata
+
+_DONE = object()
+
+
+class ChunkedAudioWriter:
+    """
+    Grava a saída em blocos de até `block_frames` quadros em uma thread
+    própria, com o arquivo (`soundfile.SoundFile`) aberto do início ao fim.
+
+    No CuPy, cada bloco é copiado de forma assíncrona para um de `buffers`
+    buffers fixados no host enquanto a thread codifica o anterior, então
+    cópia, codificação e o cálculo seguinte se sobrepõem. No NumPy os blocos
+    já estão no host e vão direto para a fila, sem cópia. Em ambos os casos
+    o dtype é preservado (float32 ou float64, sem `astype`); os blocos não
+    devem ser alterados depois de `write`.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        sample_rate: int,
+        channels: int,
+        fmt: AudioTypes,
+        backend: ArrayBackend,
+        block_frames: int = 262_144,
+        buffers: int = 2,
+        opus: Optional[OpusSettings] = None,
+        metadata: Optional[OutputMetadata] = None,
+    ) -> None:
+        self.backend = backend
+        self.block_frames = block_frames
+        self.frames = 0
+        self._file = open_audio_writer(
+            file_path, sample_rate, channels, fmt, opus, metadata
+        )
+        self._pending: queue.Queue = queue.Queue(maxsize=buffers)
+        self._free: queue.Queue = queue.Queue()
+        self._buffers: list[NpArray] = []
+        self._max_buffers = buffers
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(
+            target=self._run, name="audio-writer", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._pending.get()
+            if item is _DONE:
+                return
+            host, event, buffer, _source = item
+            try:
+                if self._error is None:
+                    self.backend.wait_event(event)
+                    self._file.write(host)
+            except BaseException as exc:
+                self._error = exc
+            finally:
+                if buffer is not None:
+                    self._free.put(buffer)
+
+    def _host_buffer(self, dtype: Any, channels: int) -> NpArray:
+        shape = (self.block_frames, channels)
+        try:
+            buffer = self._free.get_nowait()
+        except queue.Empty:
+            if len(self._buffers) < self._max_buffers:
+                buffer = self.backend.host_buffer(shape, dtype)
+                self._buffers.append(buffer)
+            else:
+                buffer = self._free.get()
+        return buffer
+
+    def _check(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def write(self, block: Any) -> None:
+        """Enfileira `block` (n, canais); bloqueia se todos os buffers estão em uso."""
+        xp = self.backend.xp
+        for start in range(0, len(block), self.block_frames):
+            self._check()
+            chunk = block[start : start + self.block_frames]
+            if self.backend.host_resident:
+                self._pending.put((chunk, None, None, None))
+            else:
+                chunk = xp.ascontiguousarray(chunk)
+                buffer = self._host_buffer(chunk.dtype, chunk.shape[1])
+                host = buffer[: len(chunk)]
+                event = self.backend.copy_to_host_async(chunk, host)
+                # `chunk` segue na fila até a cópia terminar.
+                self._pending.put((host, event, buffer, chunk))
+            self.frames += len(chunk)
+
+    def close(self) -> None:
+        self._pending.put(_DONE)
+        self._thread.join()
+        self._file.close()
+        self._buffers.clear()
+        self._check()
+
+    def __enter__(self) -> "ChunkedAudioWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, *exc: object) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        # Abortado: a thread só drena a fila, sem gravar o resto; a exceção
+        # original prevalece sobre a do fechamento.
+        self._error = self._error or RuntimeError("Gravação interrompida.")
+        try:
+            self.close()
+        except Exception:
+            pass
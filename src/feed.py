@@ -2,7 +2,6 @@ from typing import Optional, Union, TypeAlias, Tuple, Callable, Sequence, Any, c
 from dataclasses import dataclass, field
 import numpy as np
 import cupy as cp
-from pydub import AudioSegment
 import soundfile as sf
 import os
 import logging
@@ -17,6 +16,8 @@ from threading import Lock
 from contextlib import contextmanager
 import cupy as cp
 import gc
+from .fat.decoders import decode_file
+from .fat.io_handlers import PCM16_SCALE
 
 
 class AudioTypes(Enum):
@@ -65,7 +66,7 @@ class AudioData:
     sample_rate: int
     samples: NpArray
     bitrate: Optional[int]
-    audio_segment: AudioSegment
+    channels: int
 
 
 # --- I/O Handlers ---
@@ -84,10 +85,10 @@ def read_audio(file_path: str, fmt: str) -> AudioData:
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
 
-    extra_params = ["-drc_scale", "0"]
-    audio = AudioSegment.from_file(file_path, format=fmt, parameters=extra_params)
-    samples = np.array(audio.get_array_of_samples(), dtype=np.float32)
-    sample_rate = audio.frame_rate
+    # Decodifica direto para float32 intercalado (soundfile ou pipe do ffmpeg),
+    # reescalado para a faixa de inteiros de 16 bits que o pydub entregava.
+    samples, sample_rate, channels = decode_file(file_path, fmt)
+    samples *= PCM16_SCALE
 
     # Pattern matching para bitrate
     match fmt:
@@ -100,15 +101,15 @@ def read_audio(file_path: str, fmt: str) -> AudioData:
         case "wav":
             bitrate = WAVE(file_path).info.bitrate
         case _:
-            duration = len(audio) / 1000.0
-            bitrate = int((len(samples) * 8) / duration) if duration > 0 else None
+            duration = len(samples) / sample_rate
+            bitrate = int((samples.size * 8) / duration) if duration > 0 else None
 
-    # Ajuste para estéreo
-    if audio.channels == 2:
-        samples = samples.reshape((-1, 2))
+    # Mono como vetor 1-D
+    if channels == 1:
+        samples = samples[:, 0]
 
     return AudioData(
-        sample_rate=sample_rate, samples=samples, bitrate=bitrate, audio_segment=audio
+        sample_rate=sample_rate, samples=samples, bitrate=bitrate, channels=channels
     )
 
 
@@ -168,17 +169,27 @@ def initialize_ist(data: CpArray, threshold: float) -> CpArray:
 
 
 def iterative_soft_thresholding(
-    data: CpArray, max_iter: int, threshold: float
+    data: CpArray, max_iter: int, threshold: float, real_fft: bool = True
 ) -> CpArray:
     """
     Aplica IST via FFT, com reconstrução harmônica.
+    Args:
+        real_fft: Usa rfft/irfft (padrão). Para sinal real o espectro é
+            hermitiano, então o resultado equivale a ifft(...).real com
+            metade dos bins e cerca de metade do custo por iteração.
     """
+    n = len(data)
     data_thres = initialize_ist(data, threshold)
     for i in range(max_iter):
         # logger.info(f"iterative_soft_thresholding ({i})")
-        data_fft = cp.fft.fft(data_thres)
-        data_fft_thres = cp.where(cp.abs(data_fft) > threshold, data_fft, 0)
-        data_thres = cp.fft.ifft(data_fft_thres).real
+        if real_fft:
+            data_fft = cp.fft.rfft(data_thres)
+            data_fft_thres = cp.where(cp.abs(data_fft) > threshold, data_fft, 0)
+            data_thres = cp.fft.irfft(data_fft_thres, n=n)
+        else:
+            data_fft = cp.fft.fft(data_thres)
+            data_fft_thres = cp.where(cp.abs(data_fft) > threshold, data_fft, 0)
+            data_thres = cp.fft.ifft(data_fft_thres).real
         harmonics = cp.sin(cp.linspace(0, 2 * cp.pi, len(data_thres)))
         data_thres += 0.1 * harmonics
     return data_thres
@@ -255,30 +266,38 @@ def normalize_signal(signal: CpArray) -> CpArray:
 
 
 def process_channel(
-    channel: CpArray, upscale_factor: int, max_iter: int, threshold: float
+    channel: CpArray,
+    upscale_factor: int,
+    max_iter: int,
+    threshold: float,
+    real_fft: bool = True,
 ) -> CpArray:
     """
     Pipeline funcional para um canal.
     """
     expanded = new_interpolation_algorithm(channel, upscale_factor)
-    ist = iterative_soft_thresholding(expanded, max_iter, threshold)
+    ist = iterative_soft_thresholding(expanded, max_iter, threshold, real_fft)
     return expanded + ist
 
 
 def upscale_channels(
-    channels: CpArray, upscale_factor: int, max_iter: int, threshold: float
+    channels: CpArray,
+    upscale_factor: int,
+    max_iter: int,
+    threshold: float,
+    real_fft: bool = True,
 ) -> CpArray:
     """
-    Aplica pipeline funcional a todos os canais.
+    Aplica pipeline funcional a todos os canais. Os canais têm o mesmo
+    comprimento, então planos de FFT e blocos do pool são reaproveitados
+    de um canal para o outro; a memória é liberada por `gpu_memory_scope`.
     """
     results = []
     for ch in channels.T:
-        out = process_channel(ch, upscale_factor, max_iter, threshold)
+        out = process_channel(ch, upscale_factor, max_iter, threshold, real_fft)
         results.append(out)
         del ch, out
-        cp.cuda.Stream.null.synchronize()
-        cp.get_default_memory_pool().free_all_blocks()
-        cp.fft.config.get_plan_cache().clear()
+    cp.cuda.Stream.null.synchronize()
     return cp.column_stack(results)
 
 
@@ -301,6 +320,7 @@ class UpscaleConfig:
     toggle_normalize: bool = True
     toggle_autoscale: bool = True
     toggle_adaptive_filter: bool = True
+    use_real_fft: bool = True
 
 
 # --- Funções Utilitárias ---
@@ -327,8 +347,6 @@ def prepare_audio(cfg: UpscaleConfig) -> Tuple[CpArray, AudioData, int]:
     """
     audio_data = read_audio(cfg.input_file_path, cfg.source_format)
     samples = cp.array(audio_data.samples, dtype=cp.float32)
-    if audio_data.audio_segment.channels == 2:
-        samples = samples.reshape((-1, 2))
     target_bitrate = cfg.target_bitrate_kbps * 1000
     upscale_factor = (
         round(target_bitrate / audio_data.bitrate) if audio_data.bitrate else 4
@@ -347,6 +365,7 @@ def process_channels(
         upscale_factor=upscale_factor,
         max_iter=cfg.max_iterations,
         threshold=cfg.threshold_value,
+        real_fft=cfg.use_real_fft,
     )
     if cfg.toggle_autoscale:
         upscaled = cp.column_stack(
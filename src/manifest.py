@@ -0,0 +1,87 @@
+# src/manifest.py
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any, Final, Optional
+
+# O hash das configurações cobre a configuração efetiva (padrões incluídos):
+# incrementar só quando o código da cadeia de DSP mudar a saída sem que
+# nenhuma configuração mude.
+PIPELINE_VERSION: Final[str] = "1"
+# Incrementar quando a forma de gravar tags/capa mudar.
+TAGGING_VERSION: Final[str] = "2"
+
+_MANIFEST_DIR: Final[str] = ".manifests"
+
+
+class JobPlan(Enum):
+    SKIP = "skip"
+    RETAG = "retag"
+    FULL = "full"
+
+
+@dataclass(frozen=True, slots=True)
+class JobManifest:
+    video_id: str
+    output_path: str
+    config_hash: str
+    pipeline_version: str
+    source_hash: str
+    title: str
+    thumbnail_url: str
+    tagging_version: str = TAGGING_VERSION
+    # Falso se a thumbnail falhou: a próxima execução refaz as tags.
+    has_cover: bool = True
+
+
+def config_fingerprint(settings: dict[str, Any]) -> str:
+    """Hash estável das configurações efetivas de download e DSP."""
+    payload = json.dumps(settings, sort_keys=True, default=str).encode()
+    return hashlib.sha256(payload).hexdigest()
+
+
+def manifest_path(output_dir: str, video_id: str) -> Path:
+    return Path(output_dir) / _MANIFEST_DIR / f"{video_id}.json"
+
+
+def load_manifest(output_dir: str, video_id: str) -> Optional[JobManifest]:
+    try:
+        data = json.loads(manifest_path(output_dir, video_id).read_text("utf-8"))
+        return JobManifest(**data)
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def save_manifest(output_dir: str, manifest: JobManifest) -> None:
+    path = manifest_path(output_dir, manifest.video_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(asdict(manifest), ensure_ascii=False), "utf-8")
+    os.replace(tmp, path)
+
+
+def plan_job(
+    manifest: Optional[JobManifest],
+    fingerprint: str,
+    source_hash: Optional[str] = None,
+) -> JobPlan:
+    """
+    Decide o que refazer para um vídeo a partir do manifesto da última
+    execução: nada, apenas as tags (também quando a capa ficou faltando),
+    ou download + DSP + tags. `source_hash`, quando conhecido (áudio já no
+    cache de downloads), precisa coincidir com o da fonte que gerou a saída.
+    """
+    if (
+        manifest is None
+        or manifest.pipeline_version != PIPELINE_VERSION
+        or manifest.config_hash != fingerprint
+        or (source_hash is not None and manifest.source_hash != source_hash)
+        or not os.path.exists(manifest.output_path)
+    ):
+        return JobPlan.FULL
+    if manifest.tagging_version != TAGGING_VERSION or not manifest.has_cover:
+        return JobPlan.RETAG
+    return JobPlan.SKIP
@@ -0,0 +1,117 @@
+# src/playlist.py
+from itertools import islice
+from typing import Any, Callable, Final, Iterable, Iterator, Optional
+from urllib.parse import parse_qs, urlparse
+import yt_dlp
+from src.utils import clean_youtube_url
+
+_CHANNEL_PREFIXES: Final[tuple[str, ...]] = ("@", "channel/", "c/", "user/")
+_CHANNEL_TABS: Final[frozenset[str]] = frozenset(
+    {"videos", "shorts", "streams", "playlists", "releases"}
+)
+_MAX_NESTING: Final[int] = 2
+
+
+def is_collection_url(url: str) -> bool:
+    """Playlist (`list=`, incluindo mixes `RD...`) ou canal do YouTube."""
+    parsed = urlparse(url if url.startswith("http") else "https://" + url)
+    path = parsed.path.strip("/")
+    return (
+        "list" in parse_qs(parsed.query)
+        or path == "playlist"
+        or path.startswith(_CHANNEL_PREFIXES)
+    )
+
+
+def _collection_target(url: str) -> str:
+    """
+    A raiz de um canal lista abas (Vídeos, Shorts...), não vídeos; aponta
+    direto para a aba de vídeos para não expandir cada aba.
+    """
+    parsed = urlparse(url if url.startswith("http") else "https://" + url)
+    parts = parsed.path.strip("/").split("/")
+    if parsed.path.strip("/").startswith(_CHANNEL_PREFIXES):
+        head = 1 if parts[0].startswith("@") else 2
+        if len(parts) <= head or parts[head] not in _CHANNEL_TABS:
+            return f"https://www.youtube.com/{'/'.join(parts[:head])}/videos"
+    return url
+
+
+def _flat_options() -> dict[str, Any]:
+    return {
+        "extract_flat": "in_playlist",
+        "lazy_playlist": True,
+        "noplaylist": False,
+        "quiet": True,
+        "skip_download": True,
+    }
+
+
+def _iter_flat_ids(ydl: yt_dlp.YoutubeDL, url: str, depth: int = 0) -> Iterator[str]:
+    info = ydl.extract_info(url, download=False, process=False)
+    if info is None:
+        return
+    if info.get("_type") in ("url", "url_transparent") and depth < _MAX_NESTING:
+        yield from _iter_flat_ids(ydl, info["url"], depth + 1)
+        return
+    if info.get("_type") not in ("playlist", "multi_video"):
+        if video_id := info.get("id"):
+            yield video_id
+        return
+    for entry in info.get("entries") or ():
+        if not entry:
+            continue
+        if entry.get("ie_key") == "YoutubeTab" or entry.get("_type") == "playlist":
+            if depth < _MAX_NESTING and entry.get("url"):
+                yield from _iter_flat_ids(ydl, entry["url"], depth + 1)
+            continue
+        if video_id := entry.get("id"):
+            yield video_id
+
+
+def iter_collection_links(url: str, limit: Optional[int] = None) -> Iterator[str]:
+    """
+    Enumera os vídeos de uma playlist ou canal com extração "flat" do yt-dlp:
+    só as páginas da listagem são baixadas, nunca a página de cada vídeo, e
+    as entradas são produzidas conforme cada página chega.
+    """
+    with yt_dlp.YoutubeDL(_flat_options()) as ydl:  # type: ignore
+        ids = _iter_flat_ids(ydl, _collection_target(url))
+        for video_id in islice(ids, limit):
+            yield f"https://www.youtube.com/watch?v={video_id}"
+
+
+def expand_links(
+    links: Iterable[str],
+    exclude: Iterable[str] = (),
+    limit: Optional[int] = None,
+    on_error: Optional[Callable[[str, Exception], None]] = None,
+) -> Iterator[str]:
+    """
+    Expande playlists e canais em links de vídeo canônicos, sem repetir IDs
+    entre links nem os IDs de `exclude`. É um gerador: `process_youtube_links`
+    começa a baixar as primeiras entradas enquanto a listagem ainda está sendo
+    paginada, e vídeos com manifesto atualizado são pulados por lá.
+    Um link inválido ou uma listagem que falha no meio vai para
+    `on_error(link, erro)` (sem ele, só é avisado) e os demais seguem; as
+    entradas já produzidas pela listagem continuam valendo.
+    """
+    seen: set[str] = set(exclude)
+    for link in links:
+        try:
+            candidates = (
+                iter_collection_links(link, limit)
+                if is_collection_url(link)
+                else iter([clean_youtube_url(link)])
+            )
+            for candidate in candidates:
+                video_id = candidate.rsplit("=", 1)[-1]
+                if video_id in seen:
+                    continue
+                seen.add(video_id)
+                yield candidate
+        except Exception as exc:
+            if on_error is None:
+                print(f"  ⚠️  Link ignorado: {link}: {exc}")
+            else:
+                on_error(link, exc)
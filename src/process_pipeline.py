@@ -1,88 +1,653 @@
-from typing import Sequence
+from typing import Any, Callable, Iterable, Iterator, Optional
 from pathlib import Path
-from src.downloader import download_audio
-from src.types import DownloadResult
-from src.utils import ensure_directory_exists, cleanup_temp_files
-
-from .fat.pipeline import upscale, UpscaleConfig
-from .fat.types import AudioTypes
-from multiprocessing import Pool
-from functools import partial
+from dataclasses import asdict, replace
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial, wraps
+from src.cache import DownloadCache
+from src.cover_art import (
+    CoverArtService,
+    default_cover_service,
+    youtube_thumbnail_url,
+)
+from src.downloader import cached_source_hash, download_audio
+from src.executor import Stage, StagedRunReport, run_stages
+from src.manifest import (
+    JobManifest,
+    JobPlan,
+    PIPELINE_VERSION,
+    config_fingerprint,
+    load_manifest,
+    plan_job,
+    save_manifest,
+)
+from src.types import (
+    CoverArt,
+    CoverArtConfig,
+    DownloadCacheConfig,
+    DownloadMode,
+    DownloadResult,
+    ExecutorConfig,
+    LinkJob,
+)
+from src.utils import ensure_directory_exists, cleanup_temp_files, _extract_video_id
+
+from .fat.backend import get_backend
+from .fat.config import opus_settings, workspace_budget_bytes
+from .fat.io_handlers import RESERVED_TAG
+from .fat.pcm_cache import source_digest
+from .fat.pipeline import (
+    shared_output_for,
+    upscale,
+    upscale_shared,
+    write_shared,
+    UpscaleConfig,
+)
+from .fat.shared_pcm import (
+    SharedMemoryFull,
+    SharedPcm,
+    decode_to_shared,
+    release_shared,
+)
+from .fat.tracing import new_trace_id, profiled, span, trace_context
+from .fat.types import AudioTypes, OutputMetadata, UpscaleResult
+from .fat.workspace import get_workspace
 from typing import Final
 import requests
+from mutagen import PaddingInfo
 from mutagen.flac import FLAC, Picture
-import requests
-import mimetypes
+from mutagen.oggopus import OggOpus
+import base64
 import multiprocessing as mp
-import cupy as cp
+import os
 
+_SOURCE_FORMATS: Final[dict[str, AudioTypes]] = {
+    ".mp3": AudioTypes.MP3,
+    ".webm": AudioTypes.WEBM,
+    ".m4a": AudioTypes.M4A,
+    ".ogg": AudioTypes.OGG,
+    ".flac": AudioTypes.FLAC,
+    ".wav": AudioTypes.WAV,
+    ".opus": AudioTypes.OPUS,
+}
 
-def process_link(link: str, output_dir: str) -> None:
 
-    cp.fft.config.set_plan_cache_size(4)
-    print(f"\n🎬 Processando: {link}")
+def source_format_for(audio_path: str) -> AudioTypes:
+    suffix = Path(audio_path).suffix.lower()
+    if suffix not in _SOURCE_FORMATS:
+        raise ValueError(f"Formato de origem não suportado: {audio_path}")
+    return _SOURCE_FORMATS[suffix]
 
-    # Baixando mp3
-    result: DownloadResult = download_audio(link, output_dir)
-    print(f"  ⬇️  Baixado: {str(result.audio_path.title)}")
 
-    # Melhorando musica
-    flac_path = output_dir + "/" + f"{result.title}.flac"
-    config = UpscaleConfig(
+DEFAULT_UPSCALE_SETTINGS: Final[dict[str, Any]] = {
+    "target_format": AudioTypes.FLAC,
+    "max_iterations": 3_000,
+    "threshold_value": 0.6,
+    "target_bitrate_kbps": 1411,
+    "toggle_normalize": True,
+    "toggle_autoscale": True,
+    "toggle_adaptive_filter": True,
+    "max_support_change": 0,
+    "convergence_check_interval": 100,
+}
+
+
+# Espaço reservado no cabeçalho do FLAC para a capa (a conhecida ou, sem
+# ela, o tamanho de uma capa típica) mais folga para os comentários.
+_COVER_RESERVE_BYTES: Final[int] = 512 * 1024
+_TAGS_RESERVE_BYTES: Final[int] = 16 * 1024
+
+
+def metadata_reserve_bytes(cover: Optional[CoverArt]) -> int:
+    cover_bytes = len(cover.data) if cover is not None else 0
+    return max(cover_bytes, _COVER_RESERVE_BYTES) + _TAGS_RESERVE_BYTES
+
+
+def build_upscale_config(
+    result: DownloadResult,
+    output_dir: str,
+    settings: dict[str, Any] = DEFAULT_UPSCALE_SETTINGS,
+    cover: Optional[CoverArt] = None,
+) -> UpscaleConfig:
+    output_path = output_dir + "/" + f"{result.title}.{settings['target_format']}"
+    source_format = source_format_for(result.audio_path)
+    return UpscaleConfig(
         input_file_path=result.audio_path,
-        output_file_path=flac_path,
+        output_file_path=output_path,
+        source_format=source_format,
+        source_bitrate_kbps=result.abr if source_format != AudioTypes.MP3 else None,
+        metadata=OutputMetadata(
+            title=result.title, reserved_bytes=metadata_reserve_bytes(cover)
+        ),
+        **settings,
+    )
+
+
+# Campos de `UpscaleConfig` fora do hash do manifesto: os que dependem de
+# cada job (caminhos, fonte, tags) e os que só mudam como a execução roda.
+_UNFINGERPRINTED_FIELDS: Final[frozenset[str]] = frozenset(
+    {
+        "input_file_path",
+        "output_file_path",
+        "source_format",
+        "source_bitrate_kbps",
+        "metadata",
+        "backend",
+        "fft_workers",
+        "workspace_budget_mb",
+        "write_block_frames",
+        "pcm_cache_dir",
+        "stream_window_frames",
+        "stream_overlap_frames",
+    }
+)
+
+
+def effective_settings(settings: dict[str, Any]) -> dict[str, Any]:
+    """Configuração efetiva do DSP (com os padrões de `UpscaleConfig`)."""
+    config = UpscaleConfig(
+        input_file_path="",
+        output_file_path="",
         source_format=AudioTypes.MP3,
-        target_format=AudioTypes.FLAC,
-        max_iterations=3_000,
-        threshold_value=0.6,
-        target_bitrate_kbps=1411,
-        toggle_normalize=True,
-        toggle_autoscale=True,
-        toggle_adaptive_filter=True,
+        **settings,
     )
-    upscale(config)
-    cp.fft.config.get_plan_cache().clear()
-    cp.get_default_memory_pool().free_all_blocks()
-    cp.cuda.Stream.null.synchronize()
+    return {
+        name: value
+        for name, value in asdict(config).items()
+        if name not in _UNFINGERPRINTED_FIELDS
+    }
 
-    # Adicionando Thumbmail
-    response: Final[requests.Response] = requests.get(result.thumbnail_url, timeout=10)
-    response.raise_for_status()
-    image_data: Final[bytes] = response.content
-    mime_type: str = mimetypes.guess_type(result.thumbnail_url)[0] or "image/jpeg"
-    flac_audio: Final[FLAC] = FLAC(flac_path)
-    flac_audio["title"] = result.title
-    flac_audio.clear_pictures()
+
+def job_fingerprint(settings: dict[str, Any], download_mode: DownloadMode) -> str:
+    return config_fingerprint(
+        {**effective_settings(settings), "download_mode": download_mode.value}
+    )
+
+
+def upscale_task(
+    config: UpscaleConfig, trace_id: Optional[str] = None
+) -> UpscaleResult:
+    """
+    Executa o upscaling de uma faixa. Roda no processo de DSP, onde o
+    backend (e a GPU, se houver) é inicializado. Os spans do DSP herdam
+    `trace_id` do link.
+    """
+    backend = get_backend(config.backend, config.fft_workers)
+    workspace = get_workspace(backend, workspace_budget_bytes(config))
+    with (
+        trace_context(trace_id),
+        profiled("upscale"),
+        span("upscale", backend) as attrs,
+    ):
+        upscale_result = upscale(config)
+        workspace.trim()
+        attrs.update(workspace=workspace.stats())
+    return upscale_result
+
+
+def upscale_shared_task(
+    config: UpscaleConfig,
+    pcm: SharedPcm,
+    output: SharedPcm,
+    trace_id: Optional[str] = None,
+) -> UpscaleResult:
+    """`upscale_task` sobre PCM em memória compartilhada (ver `_decode_stage`)."""
+    backend = get_backend(config.backend, config.fft_workers)
+    workspace = get_workspace(backend, workspace_budget_bytes(config))
+    with (
+        trace_context(trace_id),
+        profiled("upscale"),
+        span("upscale", backend) as attrs,
+    ):
+        result = upscale_shared(config, pcm, output)
+        workspace.trim()
+        attrs.update(workspace=workspace.stats())
+    return result
+
+
+def fetch_cover(
+    thumbnail_url: str,
+    video_id: Optional[str] = None,
+    service: Optional[CoverArtService] = None,
+) -> CoverArt:
+    return (service or default_cover_service()).get(thumbnail_url, video_id)
+
+
+def _cover_picture(cover: CoverArt) -> Picture:
     picture: Final[Picture] = Picture()
-    picture.data = image_data
+    picture.data = cover.data
     picture.type = 3
-    picture.mime = mime_type
+    picture.mime = cover.mime
     picture.desc = "Cover"
-    flac_audio.add_picture(picture)
-    flac_audio.save()
+    return picture
 
-    # Limpeza de arquivos temporários
+
+def _flac_padding(info: PaddingInfo) -> int:
+    # Cabendo no espaço reservado, a sobra vira PADDING e só o cabeçalho é
+    # regravado. Senão (arquivo sem reserva), o arquivo é reescrito uma vez,
+    # já com reserva para as próximas tags.
+    if info.padding >= 0:
+        return info.padding
+    return metadata_reserve_bytes(None)
+
+
+def tag_flac(
+    flac_path: str,
+    title: str,
+    cover: Optional[CoverArt],
+    video_id: Optional[str] = None,
+) -> None:
+    """
+    Grava título, ID do vídeo e capa no espaço reservado pelo writer
+    (`OutputMetadata`), sem mover o áudio.
+    """
+    flac_audio: Final[FLAC] = FLAC(flac_path)
+    flac_audio.pop(RESERVED_TAG, None)
+    flac_audio["title"] = title
+    if video_id:
+        flac_audio["youtube_video_id"] = video_id
+    flac_audio.clear_pictures()
+    if cover is not None:
+        flac_audio.add_picture(_cover_picture(cover))
+    flac_audio.save(padding=_flac_padding)
+
+
+def tag_opus(
+    opus_path: str,
+    title: str,
+    cover: Optional[CoverArt],
+    video_id: Optional[str] = None,
+) -> None:
+    """Título e capa em Ogg Opus (capa como METADATA_BLOCK_PICTURE em base64)."""
+    opus_audio: Final[OggOpus] = OggOpus(opus_path)
+    opus_audio["title"] = title
+    if video_id:
+        opus_audio["youtube_video_id"] = video_id
+    opus_audio.pop("metadata_block_picture", None)
+    if cover is not None:
+        opus_audio["metadata_block_picture"] = [
+            base64.b64encode(_cover_picture(cover).write()).decode("ascii")
+        ]
+    opus_audio.save()
+
+
+def tag_output(
+    output_path: str,
+    fmt: AudioTypes,
+    title: str,
+    cover: Optional[CoverArt],
+    video_id: Optional[str] = None,
+) -> None:
+    match fmt:
+        case AudioTypes.FLAC:
+            tag_flac(output_path, title, cover, video_id)
+        case AudioTypes.OPUS:
+            tag_opus(output_path, title, cover, video_id)
+        case _:
+            # WAV: sem tags.
+            pass
+
+
+def cleanup_download(result: DownloadResult) -> None:
+    if not result.temporary:
+        return
+    audio_path = Path(result.audio_path)
     cleanup_temp_files(
         [
-            Path(result.audio_path),
-            Path(result.audio_path.replace(".mp3", ".webp")),
+            audio_path,
+            audio_path.with_suffix(".webp"),
+            audio_path.with_suffix(".jpg"),
         ]
     )
 
 
-def process_youtube_links(links: Sequence[str], output_dir: str) -> None:
+def process_link(
+    link: str,
+    output_dir: str,
+    cache: Optional[DownloadCache] = None,
+    download_mode: DownloadMode = DownloadMode.MP3,
+) -> None:
+
+    print(f"\n🎬 Processando: {link}")
+    trace_id = _extract_video_id(link) or new_trace_id()
+
+    # Baixando áudio
+    with trace_context(trace_id), span("download", link=link):
+        result: DownloadResult = download_audio(link, output_dir, cache, download_mode)
+    print(f"  ⬇️  Baixado: {str(result.audio_path.title)}")
+
+    # Thumbnail antes do upscaling: o writer reserva o espaço dela no FLAC
+    cover = fetch_cover(result.thumbnail_url, result.video_id)
+
+    # Melhorando musica
+    config = build_upscale_config(result, output_dir, cover=cover)
+    upscale_result = upscale_task(config, trace_id)
+    print(
+        f"  🔁 IST: {upscale_result.ist_iterations}/{config.max_iterations} iterações"
+    )
+
+    # Adicionando Thumbmail
+    with trace_context(trace_id), span("tag", has_cover=cover is not None):
+        tag_output(
+            config.output_file_path,
+            config.target_format,
+            result.title,
+            cover,
+            result.video_id,
+        )
+
+    # Limpeza de arquivos temporários
+    cleanup_download(result)
+
+
+def _plan_jobs(
+    links: Iterable[str],
+    output_dir: str,
+    fingerprint: str,
+    covers: CoverArtService,
+    cache: Optional[DownloadCache] = None,
+    download_mode: DownloadMode = DownloadMode.MP3,
+) -> Iterator[LinkJob]:
+    """
+    Compara cada link com o manifesto da última execução: links atualizados
+    são pulados, e os que só precisam de novas tags não passam por download
+    nem DSP. Se o áudio já está no cache de downloads, o hash dele também
+    precisa bater com o do manifesto. A capa dos demais já começa a ser
+    baixada aqui, pelo ID do vídeo.
+    """
+    for link in links:
+        video_id = _extract_video_id(link)
+        manifest = load_manifest(output_dir, video_id) if video_id else None
+        source_hash = None
+        if manifest is not None and cache is not None:
+            source_hash = cached_source_hash(manifest.video_id, cache, download_mode)
+        plan = plan_job(manifest, fingerprint, source_hash)
+        if video_id and plan != JobPlan.SKIP:
+            covers.prefetch(youtube_thumbnail_url(video_id), video_id)
+        match plan:
+            case JobPlan.SKIP:
+                print(f"  ⏭️  Atualizado, pulando: {link}")
+            case JobPlan.RETAG:
+                assert manifest is not None
+                yield LinkJob(
+                    link=link,
+                    output_dir=output_dir,
+                    download=DownloadResult(
+                        audio_path="",
+                        title=manifest.title,
+                        thumbnail_url=manifest.thumbnail_url,
+                        video_id=video_id,
+                        temporary=False,
+                    ),
+                    output_path=manifest.output_path,
+                    video_id=video_id,
+                    trace_id=video_id,
+                    fingerprint=fingerprint,
+                    source_hash=manifest.source_hash,
+                    retag_only=True,
+                )
+            case JobPlan.FULL:
+                yield LinkJob(
+                    link=link,
+                    output_dir=output_dir,
+                    video_id=video_id,
+                    trace_id=video_id or new_trace_id(),
+                    fingerprint=fingerprint,
+                )
+
+
+def _traced_stage(
+    name: str,
+) -> Callable[[Callable[..., LinkJob]], Callable[..., LinkJob]]:
+    """
+    Envolve um estágio (cujo último argumento é o `LinkJob`) em um span com o
+    trace ID do link e no perfil opcional desse link.
+    """
+
+    def decorate(fn: Callable[..., LinkJob]) -> Callable[..., LinkJob]:
+        @wraps(fn)
+        def wrapper(*args: Any) -> LinkJob:
+            job: LinkJob = args[-1]
+            with (
+                trace_context(job.trace_id),
+                profiled(name),
+                span(name, link=job.link, retag_only=job.retag_only),
+            ):
+                return fn(*args)
+
+        return wrapper
+
+    return decorate
+
+
+@_traced_stage("download")
+def _download_stage(
+    cache: Optional[DownloadCache],
+    download_mode: DownloadMode,
+    covers: CoverArtService,
+    job: LinkJob,
+) -> LinkJob:
+    if job.retag_only:
+        return job
+    print(f"\n🎬 Processando: {job.link}")
+    try:
+        result = download_audio(job.link, job.output_dir, cache, download_mode)
+    except BaseException:
+        # O link não chega ao estágio da capa: a busca antecipada é descartada.
+        if job.video_id:
+            covers.discard(youtube_thumbnail_url(job.video_id), job.video_id)
+        raise
+    print(f"  ⬇️  Baixado: {result.title}")
+    return replace(job, download=result)
+
+
+@_traced_stage("cover")
+def _cover_stage(covers: CoverArtService, job: LinkJob) -> LinkJob:
+    assert job.download is not None
+    video_id = job.video_id or job.download.video_id
+    try:
+        cover = fetch_cover(job.download.thumbnail_url, video_id, covers)
+    except requests.RequestException as exc:
+        print(f"  ⚠️  Thumbnail indisponível para {job.download.title}: {exc}")
+        cover = None
+    except BaseException:
+        cleanup_download(job.download)
+        raise
+    return replace(job, cover=cover)
+
+
+@_traced_stage("decode")
+def _decode_stage(settings: dict[str, Any], job: LinkJob) -> LinkJob:
+    """
+    Decodifica a fonte para memória compartilhada no processo principal; o
+    processo de DSP recebe só o descritor. No modo em fluxo (ou com cache de
+    PCM), ou se o PCM não couber em /dev/shm, o próprio DSP lê a fonte.
+    """
+    assert job.download is not None
+    if job.retag_only or settings.get("streaming") or settings.get("pcm_cache_dir"):
+        return job
+    audio_path = job.download.audio_path
+    try:
+        pcm = decode_to_shared(audio_path, source_format_for(audio_path))
+    except SharedMemoryFull as exc:
+        print(f"  ⚠️  {exc} O DSP vai ler o arquivo.")
+        return job
+    except BaseException:
+        cleanup_download(job.download)
+        raise
+    return replace(job, pcm=pcm)
+
+
+@_traced_stage("dsp")
+def _dsp_stage(
+    pool: ProcessPoolExecutor, settings: dict[str, Any], job: LinkJob
+) -> LinkJob:
+    assert job.download is not None
+    if job.retag_only:
+        return job
+    config = build_upscale_config(job.download, job.output_dir, settings, job.cover)
+    upscaled_pcm = None
+    try:
+        source_hash = job.download.source_hash or source_digest(job.download.audio_path)
+        if job.pcm is not None:
+            # Criado (e mantido aberto) aqui: ver `shared_output_for`.
+            try:
+                upscaled_pcm = shared_output_for(config, job.pcm)
+            except SharedMemoryFull as exc:
+                print(f"  ⚠️  {exc} A saída vai direto para o arquivo.")
+        if upscaled_pcm is None:
+            upscale_result = pool.submit(upscale_task, config, job.trace_id).result()
+        else:
+            assert job.pcm is not None
+            upscale_result = pool.submit(
+                upscale_shared_task, config, job.pcm, upscaled_pcm, job.trace_id
+            ).result()
+    except BaseException:
+        release_shared(upscaled_pcm)
+        cleanup_download(job.download)
+        raise
+    finally:
+        release_shared(job.pcm)
+    print(
+        f"  🔁 {job.download.title}: IST {upscale_result.ist_iterations}/"
+        f"{config.max_iterations} iterações"
+    )
+    return replace(
+        job,
+        output_path=upscale_result.output_file_path,
+        source_hash=source_hash,
+        bytes_in=os.path.getsize(job.download.audio_path),
+        audio_seconds=upscale_result.duration_seconds,
+        pcm=None,
+        upscaled_pcm=upscaled_pcm,
+    )
+
+
+@_traced_stage("writer")
+def _writer_stage(settings: dict[str, Any], job: LinkJob) -> LinkJob:
+    assert job.download is not None and job.output_path is not None
+    video_id = job.video_id or job.download.video_id
+    try:
+        fmt = settings["target_format"]
+        if job.upscaled_pcm is not None:
+            config = build_upscale_config(
+                job.download, job.output_dir, settings, job.cover
+            )
+            write_shared(
+                job.output_path,
+                fmt,
+                job.upscaled_pcm,
+                opus_settings(config),
+                config.metadata,
+            )
+        with span("tag", has_cover=job.cover is not None):
+            tag_output(job.output_path, fmt, job.download.title, job.cover, video_id)
+    finally:
+        release_shared(job.upscaled_pcm)
+        cleanup_download(job.download)
+    if video_id and job.fingerprint and job.source_hash:
+        save_manifest(
+            job.output_dir,
+            JobManifest(
+                video_id=video_id,
+                output_path=job.output_path,
+                config_hash=job.fingerprint,
+                pipeline_version=PIPELINE_VERSION,
+                source_hash=job.source_hash,
+                title=job.download.title,
+                thumbnail_url=job.download.thumbnail_url,
+                has_cover=job.cover is not None,
+            ),
+        )
+    print(f"  ✅ Concluído: {job.output_path}")
+    return job
+
+
+def process_youtube_links(
+    links: Iterable[str],
+    output_dir: str,
+    executor_config: Optional[ExecutorConfig] = None,
+    cache_config: Optional[DownloadCacheConfig] = None,
+    download_mode: DownloadMode = DownloadMode.MP3,
+    upscale_settings: dict[str, Any] = DEFAULT_UPSCALE_SETTINGS,
+    cover_config: Optional[CoverArtConfig] = None,
+    on_progress: Optional[Callable[[str, bool], None]] = None,
+) -> StagedRunReport:
     """
-    Processa uma lista de links do YouTube:
-    1. Baixa o áudio e thumbnail
-    2. Aplica denoising
-    3. Aplica super-resolução
-    4. Salva em FLAC com thumbnail
+    Processa uma lista de links do YouTube em estágios concorrentes:
+    1. Baixa o áudio (pool de threads)
+    2. Baixa a thumbnail (pool de threads)
+    3. Decodifica a fonte para memória compartilhada
+    4. Aplica super-resolução (pool de processos)
+    5. Salva em FLAC ou Opus com thumbnail (escritor)
+    O PCM decodificado e o resultado do DSP passam entre processos por
+    memória compartilhada; o escritor libera os segmentos ao terminar.
+    Filas limitadas entre os estágios permitem baixar o link N+1 enquanto o
+    link N é processado; falhas em um link não interrompem os demais.
+    Com `cache_config`, downloads já feitos são reaproveitados do cache local.
+    Com `DownloadMode.NATIVE`, o stream original é decodificado direto para
+    PCM, sem o MP3 intermediário.
+    Cada saída ganha um manifesto (ID do vídeo, hash das configurações,
+    versão do pipeline, hash da fonte); links cuja saída já está atualizada
+    são pulados e, se só a forma de gravar tags mudou, apenas as tags são
+    refeitas.
+    As capas são buscadas antecipadamente pelo ID do vídeo, com conexões
+    reaproveitadas e cache em disco (`cover_config`).
     """
     mp.set_start_method("spawn", force=True)
     ensure_directory_exists(output_dir)
-    process_partial = partial(process_link, output_dir=output_dir)
+    executor_config = executor_config or ExecutorConfig()
+    cache = (
+        DownloadCache(cache_config.cache_dir, cache_config.max_bytes)
+        if cache_config is not None
+        else None
+    )
 
-    # with Pool(processes=1) as pool:
-    #     pool.map(process_partial, links)
-    for i in links:
-        process_partial(i)
+    with (
+        CoverArtService(cover_config) as covers,
+        ProcessPoolExecutor(
+            max_workers=executor_config.dsp_workers, mp_context=mp.get_context("spawn")
+        ) as pool,
+    ):
+        stages = [
+            Stage(
+                "download",
+                partial(_download_stage, cache, download_mode, covers),
+                executor_config.download_workers,
+            ),
+            Stage(
+                "thumbnail",
+                partial(_cover_stage, covers),
+                executor_config.thumbnail_workers,
+            ),
+            Stage(
+                "decode",
+                partial(_decode_stage, upscale_settings),
+                executor_config.decode_workers,
+            ),
+            Stage(
+                "dsp",
+                partial(_dsp_stage, pool, upscale_settings),
+                executor_config.dsp_workers,
+            ),
+            Stage(
+                "writer",
+                partial(_writer_stage, upscale_settings),
+                executor_config.writer_workers,
+            ),
+        ]
+        report = run_stages(
+            _plan_jobs(
+                links,
+                output_dir,
+                job_fingerprint(upscale_settings, download_mode),
+                covers,
+                cache,
+                download_mode,
+            ),
+            stages,
+            queue_size=executor_config.queue_size,
+            on_progress=on_progress,
+        )
+    for failure in report.failures:
+        print(f"  ❌ {failure.item.link} falhou em '{failure.stage}': {failure.error}")
+    return report
@@ -2,7 +2,8 @@
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Sequence
+from typing import Optional, Sequence
+from .fat.shared_pcm import SharedPcm
 
 
 class AudioFormat(Enum):
@@ -12,6 +13,11 @@ class AudioFormat(Enum):
     FLAC = "flac"
 
 
+class DownloadMode(Enum):
+    MP3 = "mp3"
+    NATIVE = "native"
+
+
 @dataclass(frozen=True, slots=True)
 class DownloadConfig:
     output_dir: str
@@ -36,6 +42,61 @@ class DownloadResult:
     audio_path: str
     title: str
     thumbnail_url: str
+    video_id: Optional[str] = None
+    temporary: bool = True
+    abr: Optional[float] = None
+    # sha256 do áudio, quando já conhecido (entradas do cache de downloads).
+    source_hash: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class DownloadCacheConfig:
+    cache_dir: str = "./.cache/downloads"
+    max_bytes: int = 20 * 1024**3
+
+
+@dataclass(frozen=True, slots=True)
+class CoverArt:
+    data: bytes
+    mime: str
+
+
+@dataclass(frozen=True, slots=True)
+class CoverArtConfig:
+    cache_dir: str = "./.cache/covers"
+    pool_size: int = 8
+    retries: int = 3
+    timeout: float = 10.0
+    max_dimension: Optional[int] = 1200
+    jpeg_quality: int = 90
+
+
+@dataclass(frozen=True, slots=True)
+class ExecutorConfig:
+    download_workers: int = 2
+    thumbnail_workers: int = 4
+    decode_workers: int = 1
+    dsp_workers: int = 1
+    writer_workers: int = 1
+    queue_size: int = 4
+
+
+@dataclass(frozen=True, slots=True)
+class LinkJob:
+    link: str
+    output_dir: str
+    download: Optional[DownloadResult] = None
+    cover: Optional[CoverArt] = None
+    output_path: Optional[str] = None
+    video_id: Optional[str] = None
+    trace_id: Optional[str] = None
+    fingerprint: Optional[str] = None
+    source_hash: Optional[str] = None
+    retag_only: bool = False
+    bytes_in: int = 0
+    audio_seconds: float = 0.0
+    pcm: Optional[SharedPcm] = None
+    upscaled_pcm: Optional[SharedPcm] = None
 
 
 UrlList = Sequence[str]